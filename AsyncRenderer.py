@@ -0,0 +1,96 @@
+from dataclasses import replace
+from typing import Optional, Dict, Hashable, Iterable
+
+from PySide6.QtCore import QObject, QRunnable, QThreadPool, QThread, QSize, QRect, QPoint, Signal
+from PySide6.QtGui import QImage, QPainter, Qt
+
+from models import Item, RenderQuality
+
+
+class RenderJob(QRunnable):
+    def __init__(self, renderer: "AsyncRenderer", key: Hashable, item_id: Hashable, size: QSize,
+                 item_style, item: Item, device_pixel_ratio: float, quality: Optional[RenderQuality]) -> None:
+        super().__init__()
+        self.setAutoDelete(False)
+        self.renderer = renderer
+        self.delegate = renderer.delegate
+        self.key = key
+        self.item_id = item_id
+        self.size = QSize(size)
+        # the live style is animated on the GUI thread, the job paints from a snapshot of it
+        self.item_style = replace(item_style)
+        self.item = item
+        self.device_pixel_ratio = device_pixel_ratio
+        self.quality = quality
+        self.cancelled = False
+
+    def run(self) -> None:
+        if self.cancelled:
+            return
+        image = QImage(self.size * self.device_pixel_ratio, QImage.Format.Format_ARGB32_Premultiplied)
+        image.setDevicePixelRatio(self.device_pixel_ratio)
+        image.fill(Qt.transparent)
+        painter = QPainter(image)
+        quality_args = () if self.quality is None else (self.quality,)
+        self.delegate.paintContent(painter, QRect(QPoint(0, 0), self.size), self.item_style, self.item, *quality_args)
+        painter.end()
+        if not self.cancelled:
+            self.renderer.finished.emit(self, image)
+
+
+class AsyncRenderer(QObject):
+    rendered = Signal(object, object, QImage)
+    finished = Signal(object, QImage)
+
+    def __init__(self, delegate, parent: Optional[QObject] = None) -> None:
+        super().__init__(parent)
+        self.delegate = delegate
+        self.thread_pool = QThreadPool(self)
+        self.thread_pool.setMaxThreadCount(max(1, QThread.idealThreadCount() - 1))
+        self.jobs: Dict[Hashable, RenderJob] = dict()
+        self.finished.connect(self.job_finished)
+
+    def setDelegate(self, delegate) -> None:
+        self.cancelAll()
+        self.delegate = delegate
+
+    def isPending(self, key: Hashable) -> bool:
+        return key in self.jobs
+
+    def pendingCount(self) -> int:
+        return len(self.jobs)
+
+    def request(self, key: Hashable, item_id: Hashable, size: QSize, item_style, item: Item,
+                device_pixel_ratio: float, quality: Optional[RenderQuality] = None) -> None:
+        if key in self.jobs:
+            return
+        job = RenderJob(self, key, item_id, size, item_style, item, device_pixel_ratio, quality)
+        self.jobs[key] = job
+        self.thread_pool.start(job)
+
+    def cancel_job(self, job: RenderJob) -> None:
+        job.cancelled = True
+        self.thread_pool.tryTake(job)
+
+    def cancel(self, item_id: Hashable) -> None:
+        for key, job in list(self.jobs.items()):
+            if job.item_id == item_id:
+                self.cancel_job(self.jobs.pop(key))
+
+    def retain(self, item_ids: Iterable[Hashable]) -> None:
+        # drop work for rows that scrolled away; jobs already running finish but their result is discarded
+        item_ids = set(item_ids)
+        for key, job in list(self.jobs.items()):
+            if job.item_id not in item_ids:
+                self.cancel_job(self.jobs.pop(key))
+
+    def cancelAll(self) -> None:
+        for job in self.jobs.values():
+            self.cancel_job(job)
+        self.jobs.clear()
+
+    def job_finished(self, job: RenderJob, image: QImage) -> None:
+        if job.cancelled or self.jobs.get(job.key) is not job:
+            return
+        del self.jobs[job.key]
+        self.rendered.emit(job.item_id, job.key, image)
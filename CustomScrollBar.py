@@ -1,7 +1,8 @@
 from typing import Optional
 
-from PySide6.QtCore import QTimer, QVariantAnimation
-from PySide6.QtWidgets import QScrollBar, QWidget, QGraphicsOpacityEffect
+from PySide6.QtCore import QTimer, QVariantAnimation, QElapsedTimer
+from PySide6.QtGui import QPainter, QPaintEvent
+from PySide6.QtWidgets import QScrollBar, QWidget, QStyle, QStyleOptionSlider
 
 
 class CustomScrollBar(QScrollBar):
@@ -9,51 +10,78 @@ class CustomScrollBar(QScrollBar):
         super().__init__(parent)
         self.setSingleStep(10)
         self.setPageStep(20)
-        self.opacity_effect = QGraphicsOpacityEffect(self)
-        self.setGraphicsEffect(self.opacity_effect)
-        self.opacity_effect.setOpacity(0)
+        # the bar paints itself with this opacity instead of going through an offscreen graphics effect
+        self.opacity: float = 0
         self.hide()
-        self.timer = QTimer()
+        self.hide_delay = 1000
+        self.activity_timer = QElapsedTimer()
+        self.timer = QTimer(self)
         self.timer.setSingleShot(True)
-        self.timer.timeout.connect(self.hideScrollBar)
+        self.timer.timeout.connect(self.hide_timeout)
+        self.animation = QVariantAnimation(self)
+        self.animation.valueChanged.connect(self.set_opacity)
+        self.animation.finished.connect(self.fade_finished)
         self.sliderPressed.connect(self.slider_pressed)
         self.sliderReleased.connect(self.slider_released)
 
+    def set_opacity(self, value: float) -> None:
+        self.opacity = value
+        self.update()
+
+    def fade_finished(self) -> None:
+        if self.opacity <= 0:
+            self.hide()
+
     def slider_pressed(self) -> None:
         self.timer.stop()
-        self.show()
+        self.showScrollBar()
 
     def slider_released(self) -> None:
         self.start_single_shot()
 
     def start_single_shot(self) -> None:
-        self.opacity_effect.setOpacity(1)
-        self.show()
-        self.timer.stop()
-        self.timer.start(1000)
+        self.activity_timer.start()
+        if self.opacity < 1 or not self.isVisible():
+            self.showScrollBar()
+        # a running timer re-arms itself from the last activity when it fires, so bursts of wheel events cost nothing
+        if not self.timer.isActive():
+            self.timer.start(self.hide_delay)
+
+    def hide_timeout(self) -> None:
+        if self.isSliderDown():
+            return
+        remaining = self.hide_delay - self.activity_timer.elapsed()
+        if remaining > 0:
+            self.timer.start(remaining)
+            return
+        self.hideScrollBar()
 
     def wheelEvent(self, event) -> None:
         super().wheelEvent(event)
         self.start_single_shot()
 
-    def getAnimation(self, start_value, end_value) -> QVariantAnimation:
-        animation = QVariantAnimation(self.opacity_effect)
-        animation.setDuration(500)
-        animation.setStartValue(start_value)
-        animation.setEndValue(end_value)
+    def fade_to(self, end_value: float) -> None:
+        if self.animation.endValue() == end_value and self.animation.state() == QVariantAnimation.State.Running:
+            return
+        self.animation.stop()
+        self.animation.setStartValue(float(self.opacity))
+        self.animation.setEndValue(float(end_value))
+        self.animation.setDuration(int(500 * abs(end_value - self.opacity)))
+        self.animation.start()
 
-        def valueChanged(new_value):
-            self.opacity_effect.setOpacity(new_value / 100)
+    def showScrollBar(self) -> None:
+        self.show()
+        self.fade_to(1)
 
-        animation.valueChanged.connect(valueChanged)
-        return animation
+    def hideScrollBar(self) -> None:
+        self.fade_to(0)
 
-    def showScrollBar(self) -> None:
-        animation = self.getAnimation(0, 100)
-        animation.finished.connect(self.show)
-        animation.start()
-
-    def hideScrollBar(self):
-        animation = self.getAnimation(100, 0)
-        animation.finished.connect(self.hide)
-        animation.start()
+    def paintEvent(self, event: QPaintEvent) -> None:
+        if self.opacity <= 0:
+            return
+        painter = QPainter(self)
+        painter.setOpacity(self.opacity)
+        option = QStyleOptionSlider()
+        self.initStyleOption(option)
+        self.style().drawComplexControl(QStyle.ComplexControl.CC_ScrollBar, option, painter, self)
+        painter.end()
@@ -1,8 +1,10 @@
-from PySide6.QtCore import QSize
-from PySide6.QtGui import QPainter, QBrush, Qt
+from typing import Optional
+
+from PySide6.QtCore import QSize, QRect
+from PySide6.QtGui import QPainter, QBrush, QPen, QColor, QPixmap, Qt
 from PySide6.QtWidgets import QWidget
 
-from models import Item
+from models import Item, RenderQuality
 
 
 class Delegate:
@@ -15,9 +17,54 @@ class Delegate:
     def sizeHint(self) -> QSize:
         return QSize(self.parent().width(), 120)
 
-    def paint(self, painter: QPainter, option_rect, item_style, item: Item) -> None:
-        painter.setRenderHints(QPainter.RenderHint.Antialiasing | QPainter.RenderHint.SmoothPixmapTransform)
+    def sizeHintForItem(self, item: Item) -> QSize:
+        return self.sizeHint()
+
+    def iconRect(self, option_rect: QRect) -> QRect:
+        side = max(0, option_rect.height() - 16)
+        return QRect(option_rect.left() + 8, option_rect.top() + 8, side, side)
+
+    def iconPixmap(self, item: Item, device_pixel_ratio: float) -> Optional[QPixmap]:
+        # never decode on the paint path: a missing icon is requested in the background and painted once it is ready
+        icon_cache = self.parent().iconCache()
+        if not item.icon_path or icon_cache is None:
+            return None
+        pixmap = icon_cache.cachedPixmap(item.icon_path, device_pixel_ratio)
+        if pixmap is None:
+            icon_cache.prefetch((item.icon_path,), device_pixel_ratio)
+        return pixmap
+
+    def renderState(self, item_style, item: Item):
+        icon_cache = self.parent().iconCache()
+        icon_is_ready = bool(item.icon_path) and icon_cache is not None and icon_cache.cachedPixmap(
+            item.icon_path, self.parent().devicePixelRatioF()) is not None
+        return item_style.selected, icon_is_ready
+
+    def paint(self, painter: QPainter, option_rect, item_style, item: Item,
+              quality: RenderQuality = RenderQuality.Full) -> None:
+        # the hint is only passed on when it asks for less, so subclasses written without it keep working
+        quality_args = () if quality == RenderQuality.Full else (quality,)
+        self.paintContent(painter, option_rect, item_style, item, *quality_args)
+        self.paintDecoration(painter, option_rect, item_style, item, *quality_args)
+
+    def paintContent(self, painter: QPainter, option_rect, item_style, item: Item,
+                     quality: RenderQuality = RenderQuality.Full) -> None:
+        # runs on a worker thread when the view renders asynchronously, so it must not touch pixmaps or widgets
+        painter.setRenderHints(QPainter.RenderHint.Antialiasing | QPainter.RenderHint.SmoothPixmapTransform,
+                               quality == RenderQuality.Full)
         painter.setPen(Qt.NoPen)
         painter.setBrush(QBrush(item.color))
         painter.drawRect(option_rect)
+        if item_style.selected:
+            painter.setPen(QPen(QColor("#FFFFFF"), 2))
+            painter.setBrush(Qt.NoBrush)
+            painter.drawRect(option_rect.adjusted(1, 1, -1, -1))
+
+    def paintDecoration(self, painter: QPainter, option_rect, item_style, item: Item,
+                        quality: RenderQuality = RenderQuality.Full) -> None:
+        icon = self.iconPixmap(item, painter.device().devicePixelRatioF())
+        if icon is not None:
+            painter.drawPixmap(self.iconRect(option_rect), icon)
 
+    def paintPlaceholder(self, painter: QPainter, option_rect, item_style, item: Item) -> None:
+        painter.fillRect(option_rect, item.color)
@@ -1,90 +1,425 @@
-import uuid
-from dataclasses import dataclass
+import inspect
+import math
+import time
+from array import array
+from bisect import bisect_left
 from enum import Enum, auto
-from typing import Optional, List, Dict
+from functools import partial
+from typing import Optional, List, Dict, Tuple, Iterable, Callable, Hashable, Set, Union, Sequence
 
-from PySide6.QtCore import QRect, QVariantAnimation, QPoint, QEasingCurve, QAbstractAnimation, QObject
-from PySide6.QtGui import QPaintEvent, QPainter, Qt, QResizeEvent, QWheelEvent, QMouseEvent
-from PySide6.QtWidgets import QWidget
+from PySide6.QtCore import (QRect, QRectF, QPoint, QPointF, QSize, QEasingCurve, QObject, QAbstractItemModel, QMargins,
+                            QTimer, Signal)
+from PySide6.QtGui import QPaintEvent, QPainter, Qt, QResizeEvent, QWheelEvent, QMouseEvent, QPixmap, QColor, QImage
+from PySide6.QtWidgets import QWidget, QApplication
 
+from AsyncRenderer import AsyncRenderer
 from CustomScrollBar import CustomScrollBar
 from Delegate import Delegate
-from models import Style, Item
-
-
-@dataclass
-class Index:
-    item: Item
-    item_style: Style
-    item_id: uuid.UUID
+from FenwickTree import FenwickTree
+from FilteredItemStore import FilteredItemStore
+from FrameClock import FrameClock
+from FrameStats import FrameStats
+from IconCache import IconCache
+from ItemStore import ItemStore, CompactItemStore
+from ModelAdapter import ModelAdapter
+from RenderCache import RenderCache
+from VirtualItemStore import VirtualItemStore
+from models import Item, Index, RenderQuality
 
 
 class Flow(Enum):
     TopToBottom = auto()
     LeftToRight = auto()
+    Grid = auto()
+
+
+class ScrollHint(Enum):
+    EnsureVisible = auto()
+    PositionAtTop = auto()
+    PositionAtBottom = auto()
+    PositionAtCenter = auto()
 
 
 class DraggableListView(QWidget):
+    rowMoved = Signal(int, int)
+    # a drop as QAbstractItemModel.moveRows arguments: one move for a contiguous block, one per row otherwise
+    rowsMoved = Signal(int, int, int)
+    selectionChanged = Signal()
+    frameStatsUpdated = Signal(object)
+    orderChanged = Signal(list)
+    # rows were inserted, removed, moved by code or dragged to another view, as opposed to a drop inside the view
+    rowsRearranged = Signal()
+    rowsDropped = Signal(QObject, list, int)
+    renderQualityChanged = Signal(object)
+
     def __init__(self, parent: Optional[QWidget] = None) -> None:
         super().__init__(parent)
-        self.items_by_id: Dict[uuid.UUID, Index] = dict()
-        self.items_list: List[Index] = list()
+        self.store: Union[ItemStore, CompactItemStore, VirtualItemStore, FilteredItemStore] = ItemStore()
+        self.scroll_position = 0
         self.scroll_bar = CustomScrollBar(self)
         self.scroll_bar.valueChanged.connect(self.scroll_bar_value_changed)
         self.scroll_bar.raise_()
         self.setMouseTracking(True)
-        self.animation_map: Dict[int, QVariantAnimation] = dict()
-        self.reorder_animation: Optional[QVariantAnimation] = None
+        # animations invalidate only the rows they move, so the clock does not repaint the whole widget
+        self.clock = FrameClock(self)
 
         self.current_combobox = None
 
         self.inner_drag_is_active = False
         self.reorder_is_active = False
         self.inner_drag_start_position = QPoint()
+        self.inner_drag_start_scroll = 0
+        self.drag_cursor_pos = QPoint()
         self.dragged_item_style = None
         self.dragged_item = None
         self.current_shift_value = 0
         self.dragged_pos: float = 0
+        self.dragged_point = QPointF()
+        self.drag_base_slot = 0
+        self.drag_release_point = QPointF()
+        self.drop_progress: float = 0
         self.dragged_item_key = None
         self.dragged_item_row = None
         self.current_drop_row = None
+        self.dragged_rows: List[int] = list()
+        self.dragged_row_set: Set[int] = set()
+        self.dragged_pitch_prefix: List[float] = [0]
+        self.drag_is_armed = False
+        self.pressed_row: Optional[int] = None
+        self.selected_ids: Set[Hashable] = set()
+        self.selection_anchor_row: Optional[int] = None
         self.dragged_y_offset: float = 0
         self.current_animated_items = list()
+        self.pending_mutations: List[Callable[[], None]] = list()
+        self._drag_group: Optional[str] = None
+        self.external_drop_target: Optional["DraggableListView"] = None
+        self.external_drag_source: Optional["DraggableListView"] = None
+        self.external_block_bounds = QRect()
+        self.model_adapter: Optional[ModelAdapter] = None
+        self.shifted_item_ids: Set[Hashable] = set()
+        # the row of each item with a running offset tween, kept up to date as rows are inserted, removed or moved
+        self.offset_rows: Dict[Hashable, int] = dict()
+        self.render_cache: Optional[RenderCache] = None
+        self.async_renderer: Optional[AsyncRenderer] = None
+        self.drag_snapshots: Dict[int, QPixmap] = dict()
+        self.icon_cache: Optional[IconCache] = None
+        self._drag_shadow_radius = 8
+        self._auto_scroll = True
+        self._auto_scroll_margin = 40
+        self._auto_scroll_speed = 1200
+        self.auto_scroll_remainder: float = 0
+        self._smooth_scrolling = True
+        self._smooth_scroll_time = 60
+        self.scroll_target: Optional[float] = None
+        self.smooth_scroll_position: float = 0
+        self.is_smooth_scroll_step = False
+        self.frame_stats: Optional[FrameStats] = None
+        self.frame_delegate_time: float = 0
+        self.pending_input_time: Optional[float] = None
+        self._adaptive_quality = False
+        self._quality_frame_budget_ms = 1000 / 60
+        self._quality_restore_delay = 250
+        self.render_quality = RenderQuality.Full
+        self.paint_time_average: float = 0
+        self.last_motion_time: float = 0
+        self.quality_timer = QTimer(self)
+        self.quality_timer.setSingleShot(True)
+        self.quality_timer.timeout.connect(self.quality_timeout)
 
-        self.animation = None
+        self._row_height = 60
+        self._row_width = 120
+        self._spacing = 10
+        self._flow = Flow.TopToBottom
+        self._uniform_item_sizes = False
+        self._grid_size = QSize()
+        self.item_extents: Dict[Hashable, int] = dict()
+        self.row_pitches = FenwickTree()
 
-        self.colors = ["#ADD8E6", "#90EE90", "#FFFFE0", "#FFC0CB", "#BA55D3", "#87CEFA", "#FFE4E1", "#FFDAB9", "#B0C4DE", "#FFA07A"]
+        self.delegate = Delegate(self)
+        self.delegate_quality_methods: Set[str] = set()
+        self.update_delegate_quality_methods()
+        self.setIconCache(IconCache.instance())
 
-        for i in range(len(self.colors)):
-            self.addItem(Item(self.colors[i]))
+        self.colors = ["#ADD8E6", "#90EE90", "#FFFFE0", "#FFC0CB", "#BA55D3", "#87CEFA", "#FFE4E1", "#FFDAB9", "#B0C4DE", "#FFA07A"]
 
-        self._row_height = 60
-        self._row_width = 120
+        self.addItems(Item(color) for color in self.colors)
 
         self.setFlow(Flow.TopToBottom)
 
-        self.delegate = Delegate(self)
-        self._spacing = 10
-
     def spacing(self) -> float:
         return self._spacing
 
     def setSpacing(self, value) -> None:
         self._spacing = value
+        self.rebuildLayout()
         self.update()
 
     def setDelegate(self, delegate: QObject) -> None:
         self.delegate = delegate
+        self.update_delegate_quality_methods()
+        if self.async_renderer is not None:
+            self.async_renderer.setDelegate(delegate)
+        if self.render_cache is not None:
+            self.render_cache.clear()
+        self.invalidateItemSizes()
+
+    def update_delegate_quality_methods(self) -> None:
+        # delegates written before quality hints take four arguments, so the hint only goes to methods that accept it
+        self.delegate_quality_methods = set()
+        for name in ("paint", "paintContent", "paintDecoration"):
+            method = getattr(self.delegate, name, None)
+            if method is None:
+                continue
+            try:
+                inspect.signature(method).bind(None, None, None, None, RenderQuality.Full)
+            except (TypeError, ValueError):
+                continue
+            self.delegate_quality_methods.add(name)
+
+    def quality_args(self, method_name: str) -> Tuple[RenderQuality, ...]:
+        if self._adaptive_quality and method_name in self.delegate_quality_methods:
+            return (self.render_quality,)
+        return ()
+
+    def renderCache(self) -> Optional[RenderCache]:
+        return self.render_cache
+
+    def setRenderCacheEnabled(self, enable: bool, budget: int = 64 * 1024 * 1024) -> None:
+        if not enable:
+            # asynchronous results are delivered through the cache
+            self.setAsyncRenderingEnabled(False)
+            self.render_cache = None
+        elif self.render_cache is None:
+            self.render_cache = RenderCache(budget)
+        else:
+            self.render_cache.setBudget(budget)
+        self.update()
+
+    def iconCache(self) -> Optional[IconCache]:
+        return self.icon_cache
+
+    def setIconCache(self, icon_cache: Optional[IconCache]) -> None:
+        if self.icon_cache is not None:
+            self.icon_cache.imageReady.disconnect(self.icon_ready)
+        self.icon_cache = icon_cache
+        if icon_cache is not None:
+            icon_cache.imageReady.connect(self.icon_ready)
         self.update()
 
+    def icon_ready(self, path: str) -> None:
+        first, last = self.visibleRowRange()
+        for row in range(first, last):
+            if self.store.item(row).icon_path != path:
+                continue
+            if row in self.dragged_row_set:
+                self.drag_snapshots.pop(row, None)
+                self.update(self.dragged_block_bounds())
+            else:
+                self.update(self.row_rect(row))
+
+    def prefetch_icons(self) -> None:
+        if self.icon_cache is None:
+            return
+        # decode icons about a screen ahead in both directions while the user is still scrolling towards them
+        first, last = self.visibleRowRange()
+        count = last - first
+        rows = range(max(0, first - count), min(self.rowCount(), last + count))
+        self.icon_cache.prefetch((self.store.item(row).icon_path for row in rows), self.devicePixelRatioF())
+
+    def asyncRenderingEnabled(self) -> bool:
+        return self.async_renderer is not None
+
+    def setAsyncRenderingEnabled(self, enable: bool) -> None:
+        if enable == self.asyncRenderingEnabled():
+            return
+        if self.async_renderer is not None:
+            self.async_renderer.cancelAll()
+            self.async_renderer.deleteLater()
+            self.async_renderer = None
+        if enable:
+            if self.render_cache is None:
+                self.setRenderCacheEnabled(True)
+            self.async_renderer = AsyncRenderer(self.delegate, self)
+            self.async_renderer.rendered.connect(self.row_rendered)
+        self.update()
+
+    def row_rendered(self, item_id: Hashable, key: Hashable, image: QImage) -> None:
+        if self.render_cache is None:
+            return
+        pixmap = QPixmap.fromImage(image)
+        pixmap.setDevicePixelRatio(image.devicePixelRatio())
+        self.render_cache.insert(item_id, key, pixmap)
+        first, last = self.visibleRowRange()
+        for row in range(first, last):
+            if self.store.itemId(row) == item_id:
+                self.update(self.row_rect(row))
+                return
+
+    def retain_async_renders(self) -> None:
+        if self.async_renderer is None or not self.async_renderer.pendingCount():
+            return
+        first, last = self.visibleRowRange()
+        self.async_renderer.retain(self.store.itemId(row) for row in range(first, last))
+
+    def dragShadowRadius(self) -> int:
+        return self._drag_shadow_radius
+
+    def setDragShadowRadius(self, radius: int) -> None:
+        self._drag_shadow_radius = radius
+
+    def hasAutoScroll(self) -> bool:
+        return self._auto_scroll
+
+    def setAutoScroll(self, enable: bool) -> None:
+        self._auto_scroll = enable
+        if not enable:
+            self.clock.stopDriving("autoscroll")
+
+    def autoScrollMargin(self) -> int:
+        return self._auto_scroll_margin
+
+    def setAutoScrollMargin(self, margin: int) -> None:
+        self._auto_scroll_margin = margin
+
+    def autoScrollSpeed(self) -> int:
+        return self._auto_scroll_speed
+
+    def setAutoScrollSpeed(self, pixels_per_second: int) -> None:
+        self._auto_scroll_speed = pixels_per_second
+
+    def hasSmoothScrolling(self) -> bool:
+        return self._smooth_scrolling
+
+    def setSmoothScrolling(self, enable: bool) -> None:
+        self._smooth_scrolling = enable
+        if not enable:
+            self.stop_smooth_scroll()
+
+    def instrumentationEnabled(self) -> bool:
+        return self.frame_stats is not None
+
+    def setInstrumentationEnabled(self, enable: bool, frame_budget_ms: float = 1000 / 60) -> None:
+        self.frame_stats = FrameStats(frame_budget_ms=frame_budget_ms) if enable else None
+        self.pending_input_time = None
+
+    def frameStats(self) -> Optional[FrameStats]:
+        return self.frame_stats
+
+    def resetFrameStats(self) -> None:
+        if self.frame_stats is not None:
+            self.frame_stats = FrameStats(frame_budget_ms=self.frame_stats.frame_budget_ms)
+
+    def adaptiveQuality(self) -> bool:
+        return self._adaptive_quality
+
+    def setAdaptiveQuality(self, enable: bool, frame_budget_ms: float = 1000 / 60) -> None:
+        self._adaptive_quality = enable
+        self._quality_frame_budget_ms = frame_budget_ms
+        self.paint_time_average = 0
+        if not enable:
+            self.quality_timer.stop()
+            self.set_render_quality(RenderQuality.Full)
+
+    def renderQuality(self) -> RenderQuality:
+        return self.render_quality
+
+    def set_render_quality(self, quality: RenderQuality) -> None:
+        if quality == self.render_quality:
+            return
+        self.render_quality = quality
+        if quality == RenderQuality.Full:
+            # repaint everything that was drawn cheaply while under pressure
+            self.update()
+        else:
+            self.quality_timer.start(self._quality_restore_delay)
+        self.renderQualityChanged.emit(quality)
+
+    def is_in_motion(self) -> bool:
+        return self.dragIsActive() or self.clock.timer.isActive()
+
+    def note_motion(self) -> None:
+        # only a timestamp per event, the idle timer checks it when it fires instead of being restarted every time
+        if self._adaptive_quality:
+            self.last_motion_time = time.perf_counter()
+
+    def quality_timeout(self) -> None:
+        idle_ms = (time.perf_counter() - self.last_motion_time) * 1000
+        if self.is_in_motion() or idle_ms < self._quality_restore_delay:
+            self.quality_timer.start(max(1, int(self._quality_restore_delay - idle_ms)))
+            return
+        self.paint_time_average = 0
+        self.set_render_quality(RenderQuality.Full)
+
+    def update_render_quality(self, paint_ms: float) -> None:
+        self.paint_time_average += (paint_ms - self.paint_time_average) * 0.3
+        if self.render_quality == RenderQuality.Reduced:
+            return
+        idle_ms = (time.perf_counter() - self.last_motion_time) * 1000
+        in_motion = self.is_in_motion() or idle_ms < self._quality_restore_delay
+        if in_motion and self.paint_time_average > self._quality_frame_budget_ms:
+            self.set_render_quality(RenderQuality.Reduced)
+
+    def invalidateItem(self, row: int) -> None:
+        if self.async_renderer is not None:
+            self.async_renderer.cancel(self.store.itemId(row))
+        if self.render_cache is not None:
+            self.render_cache.invalidate(self.store.itemId(row))
+        self.update(self.row_rect(row))
+
     def setFlow(self, flow: Flow):
         self._flow = flow
-        if flow == Flow.TopToBottom:
-            self.scroll_bar.setOrientation(Qt.Orientation.Vertical)
-        else:
+        if flow == Flow.LeftToRight:
             self.scroll_bar.setOrientation(Qt.Orientation.Horizontal)
+        else:
+            self.scroll_bar.setOrientation(Qt.Orientation.Vertical)
+        self.layout_scroll_bar()
+        self.invalidateItemSizes()
+
+    def gridSize(self) -> QSize:
+        return self._grid_size
+
+    def setGridSize(self, size: QSize) -> None:
+        self._grid_size = size
+        self.updateScrollRange()
         self.update()
 
+    def cellSize(self) -> QSize:
+        if self._grid_size.isValid():
+            return self._grid_size
+        return self.delegate.sizeHint()
+
+    def columnCount(self) -> int:
+        if self.flow() != Flow.Grid:
+            return 1
+        column_pitch = self.cellSize().width() + self.spacing()
+        if column_pitch <= 0:
+            return 1
+        return max(1, int((self.width() - self.spacing()) // column_pitch))
+
+    def linePitch(self) -> int:
+        return self.cellSize().height() + self.spacing()
+
+    def cellPosition(self, slot: float) -> QPointF:
+        # top left of a grid slot in content coordinates, fractional slots interpolate between neighbouring cells
+        columns = self.columnCount()
+        column_pitch = self.cellSize().width() + self.spacing()
+        lower = math.floor(slot)
+        line, column = divmod(lower, columns)
+        position = QPointF(self.spacing() + column * column_pitch, line * self.linePitch())
+        fraction = slot - lower
+        if fraction:
+            line, column = divmod(lower + 1, columns)
+            upper = QPointF(self.spacing() + column * column_pitch, line * self.linePitch())
+            position += (upper - position) * fraction
+        return position
+
+    def uniformItemSizes(self) -> bool:
+        return self._uniform_item_sizes
+
+    def setUniformItemSizes(self, enable: bool) -> None:
+        self._uniform_item_sizes = enable
+        self.invalidateItemSizes()
+
     def flow(self) -> Flow:
         return self._flow
 
@@ -94,228 +429,1405 @@ class DraggableListView(QWidget):
     def rowWidth(self) -> int:
         return self.delegate.sizeHint().width()
 
-    def scroll_bar_value_changed(self, value) -> None:
+    def itemStore(self) -> Union[ItemStore, CompactItemStore, VirtualItemStore, FilteredItemStore]:
+        return self.store
+
+    def setItemStore(self, store: Union[ItemStore, CompactItemStore, VirtualItemStore, FilteredItemStore]) -> None:
+        if self.dragIsActive():
+            self.pending_mutations.append(partial(self.setItemStore, store))
+            return
+        # an empty store takes over the current items, a populated one (e.g. a virtual source) replaces them
+        current = self.unfiltered_store()
+        items = [current.item(row) for row in range(len(current))] if not len(store) else list()
+        if self.async_renderer is not None:
+            self.async_renderer.cancelAll()
+        if self.render_cache is not None:
+            self.render_cache.clear()
+        for item_id in self.shifted_item_ids:
+            self.stop_offset_animation(item_id)
+        self.shifted_item_ids.clear()
+        self.selected_ids.clear()
+        self.selection_anchor_row = None
+        self.store = store
+        if items:
+            self.store.insert(len(self.store), items)
+        self.invalidateItemSizes()
+
+    def ensure_not_model_backed(self, operation: str) -> None:
+        # the model adapter exchanges model rows with the view, which only match while the view shows them as they are
+        if self.model_adapter is not None:
+            raise RuntimeError(f"{operation} is not supported on a view attached to a model")
+
+    def unfiltered_store(self) -> Union[ItemStore, CompactItemStore, VirtualItemStore]:
+        return self.store.sourceStore() if isinstance(self.store, FilteredItemStore) else self.store
+
+    def isFiltered(self) -> bool:
+        return isinstance(self.store, FilteredItemStore) and self.store.isFiltered()
+
+    def filterStore(self) -> FilteredItemStore:
+        # filtering wraps the current store on first use; item ids, offsets and selection carry over
+        self.ensure_not_model_backed("filtering")
+        if not isinstance(self.store, FilteredItemStore):
+            self.store = FilteredItemStore(self.store)
+        return self.store
+
+    def setFilterText(self, text: str, prefix: bool = True) -> None:
+        self.ensure_not_model_backed("filtering")
+        if self.dragIsActive():
+            self.pending_mutations.append(partial(self.setFilterText, text, prefix))
+            return
+        self.filterStore().setFilterText(text, prefix)
+        self.filter_changed()
+
+    def setFilterPredicate(self, predicate: Optional[Callable[[Item], bool]]) -> None:
+        self.ensure_not_model_backed("filtering")
+        if self.dragIsActive():
+            self.pending_mutations.append(partial(self.setFilterPredicate, predicate))
+            return
+        self.filterStore().setPredicate(predicate)
+        self.filter_changed()
+
+    def clearFilter(self) -> None:
+        if self.dragIsActive():
+            self.pending_mutations.append(self.clearFilter)
+            return
+        if isinstance(self.store, FilteredItemStore):
+            self.store.clearFilter()
+            self.filter_changed()
+
+    def filter_changed(self) -> None:
+        for item_id in self.shifted_item_ids:
+            self.stop_offset_animation(item_id)
+        self.store.resetOffsets(self.shifted_item_ids)
+        self.shifted_item_ids.clear()
+        self.selection_anchor_row = None
+        self.rebuildLayout()
+        self.rowsChanged()
+
+    def setVirtualItems(self, row_count: int, item_for_row: Callable[[int], Item], capacity: int = 512) -> None:
+        if self.dragIsActive():
+            self.pending_mutations.append(partial(self.setVirtualItems, row_count, item_for_row, capacity))
+            return
+        # only a window of items around the viewport stays materialized, so per-item sizing would defeat it
+        self.setUniformItemSizes(True)
+        self.setItemStore(VirtualItemStore(row_count, item_for_row, capacity))
+
+    def itemExtent(self, row: int) -> int:
+        item_id = self.store.itemId(row)
+        extent = self.item_extents.get(item_id)
+        if extent is None:
+            size = self.item_size_hint(self.store.item(row))
+            extent = size.height() if self.flow() == Flow.TopToBottom else size.width()
+            self.item_extents[item_id] = extent
+        return extent
+
+    def uniformExtent(self, row: int) -> int:
+        # uniform sizes never ask the delegate, which would materialize and remember every row visited
+        if self.uniformItemSizes():
+            return self.rowHeight() if self.flow() == Flow.TopToBottom else self.rowWidth()
+        return self.itemExtent(row)
+
+    def item_size_hint(self, item: Item) -> QSize:
+        # delegates are duck-typed, and ones that only implement sizeHint size every row alike
+        size_hint_for_item = getattr(self.delegate, "sizeHintForItem", None)
+        return size_hint_for_item(item) if size_hint_for_item is not None else self.delegate.sizeHint()
+
+    def usesPitchTree(self) -> bool:
+        return not self.uniformItemSizes() and self.flow() != Flow.Grid
+
+    def defaultPitch(self) -> float:
+        if self.flow() == Flow.TopToBottom:
+            return self.rowHeight() + self.spacing()
+        if self.flow() == Flow.LeftToRight:
+            return self.rowWidth() + self.spacing()
+        # the grid lays rows out in slots, so its one-dimensional positions are slot indices
+        return 1
+
+    def rowPitch(self, row: int) -> float:
+        if not self.usesPitchTree():
+            return self.defaultPitch()
+        return self.row_pitches.value(row)
+
+    def rowStart(self, row: int) -> float:
+        if not self.usesPitchTree():
+            return row * self.defaultPitch()
+        return self.row_pitches.prefix(row)
+
+    def rowAtPosition(self, position: float) -> int:
+        if not self.usesPitchTree():
+            pitch = self.defaultPitch()
+            if position < 0 or pitch <= 0:
+                return -1
+            return min(int(position // pitch), self.rowCount())
+        return self.row_pitches.lowerBound(position)
+
+    def contentExtent(self) -> float:
+        if not self.usesPitchTree():
+            return self.rowCount() * self.defaultPitch()
+        return self.row_pitches.total()
+
+    def invalidateItemSizes(self) -> None:
+        self.item_extents.clear()
+        self.rebuildLayout()
         self.update()
 
-    def wheelEvent(self, event: QWheelEvent) -> None:
-        super().wheelEvent(event)
-        self.scroll_bar.wheelEvent(event)
+    def updateItemSize(self, row: int) -> None:
+        self.item_extents.pop(self.store.itemId(row), None)
+        if self.async_renderer is not None:
+            self.async_renderer.cancel(self.store.itemId(row))
+        if self.render_cache is not None:
+            self.render_cache.invalidate(self.store.itemId(row))
+        if self.usesPitchTree():
+            self.row_pitches.set(row, self.itemExtent(row) + self.spacing())
+        self.updateScrollRange()
+        self.update()
 
-    def resizeEvent(self, event: QResizeEvent) -> None:
+    def rebuildLayout(self) -> None:
+        if not self.usesPitchTree():
+            self.row_pitches.build(())
+        else:
+            self.row_pitches.build(self.itemExtent(row) + self.spacing() for row in range(self.rowCount()))
+        self.updateScrollRange()
+
+    def moveRowLayout(self, from_row: int, to_row: int) -> None:
+        if not self.usesPitchTree() or from_row == to_row:
+            return
+        first, last = min(from_row, to_row), max(from_row, to_row)
+        pitches = [self.row_pitches.value(row) for row in range(first, last + 1)]
+        if from_row < to_row:
+            pitches = pitches[1:] + pitches[:1]
+        else:
+            pitches = pitches[-1:] + pitches[:-1]
+        for row, pitch in enumerate(pitches, first):
+            self.row_pitches.set(row, pitch)
+
+    def updateScrollRange(self) -> None:
+        if self.flow() == Flow.Grid:
+            lines = math.ceil(self.rowCount() / self.columnCount())
+            self.scroll_bar.setRange(0, max(0, lines * self.linePitch() - self.height()))
+            return
         if self.flow() == Flow.TopToBottom:
-            _rect = QRect(0, 0, 8, self.rect().height())
-            _rect.moveRight(self.rect().right())
-            self.scroll_bar.setGeometry(_rect)
-            self.scroll_bar.setRange(0, self.rowHeight() * len(self.items_by_id) - self.height())
+            extent = self.height()
+        else:
+            extent = self.width()
+        self.scroll_bar.setRange(0, max(0, int(self.contentExtent() - extent)))
+
+    def scroll_bar_value_changed(self, value) -> None:
+        if not self.is_smooth_scroll_step:
+            # the user took over the scroll bar, or something scrolled programmatically
+            self.stop_smooth_scroll()
+        delta = self.scroll_position - value
+        self.scroll_position = value
+        self.note_motion()
+        self.prefetch_icons()
+        self.retain_async_renders()
+        extent = self.width() if self.flow() == Flow.LeftToRight else self.height()
+        if not self.isVisible() or abs(delta) >= extent:
+            self.update()
+            return
+        # move the pixels already on screen and repaint only the strip scrolled into view
+        content_rect = self.rect()
+        bar_is_visible = self.scroll_bar.isVisible()
+        if self.flow() == Flow.LeftToRight:
+            dx, dy = delta, 0
+            if bar_is_visible:
+                content_rect.setBottom(self.scroll_bar.geometry().top() - 1)
         else:
+            dx, dy = 0, delta
+            if bar_is_visible:
+                content_rect.setRight(self.scroll_bar.geometry().left() - 1)
+        self.scroll(dx, dy, content_rect)
+        if bar_is_visible:
+            self.update(self.scroll_bar.geometry())
+        if self.dragIsActive():
+            # the dragged block stays put while the rows scroll under it
+            bounds = self.dragged_block_bounds()
+            self.update(bounds)
+            self.update(bounds.translated(dx, dy))
+
+    def wheelEvent(self, event: QWheelEvent) -> None:
+        event.accept()
+        self.scroll_bar.start_single_shot()
+        horizontal = self.flow() == Flow.LeftToRight
+        pixel_delta = event.pixelDelta()
+        if not pixel_delta.isNull():
+            # touchpads deliver pixel deltas that the platform already smooths
+            self.stop_smooth_scroll()
+            delta = pixel_delta.x() if horizontal and pixel_delta.x() else pixel_delta.y()
+            self.scroll_bar.setValue(self.scroll_bar.value() - delta)
+            return
+        angle_delta = event.angleDelta()
+        delta = angle_delta.x() if horizontal and angle_delta.x() else angle_delta.y()
+        step = delta / 120 * QApplication.wheelScrollLines() * self.scroll_bar.singleStep()
+        if not self.hasSmoothScrolling():
+            self.scroll_bar.setValue(self.scroll_bar.value() - round(step))
+            return
+        start = self.scroll_target if self.scroll_target is not None else self.scroll_bar.value()
+        self.smooth_scroll_to(start - step)
+
+    def smooth_scroll_to(self, target: float) -> None:
+        target = min(max(target, self.scroll_bar.minimum()), self.scroll_bar.maximum())
+        if self.scroll_target is None:
+            self.smooth_scroll_position = float(self.scroll_bar.value())
+        self.scroll_target = target
+        if not self.clock.isDriving("scroll"):
+            self.clock.drive("scroll", self.smooth_scroll_tick)
+
+    def stop_smooth_scroll(self) -> None:
+        self.scroll_target = None
+        self.clock.stopDriving("scroll")
+
+    def smooth_scroll_tick(self, delta: int) -> bool:
+        if self.scroll_target is None:
+            return False
+        remaining = self.scroll_target - self.smooth_scroll_position
+        if abs(remaining) < 0.5:
+            self.smooth_scroll_position = self.scroll_target
+            self.scroll_target = None
+        else:
+            # exponential approach: frame-rate independent and it keeps up with repeated wheel notches
+            self.smooth_scroll_position += remaining * (1 - math.exp(-delta / self._smooth_scroll_time))
+        self.is_smooth_scroll_step = True
+        self.scroll_bar.setValue(round(self.smooth_scroll_position))
+        self.is_smooth_scroll_step = False
+        if self.inner_drag_is_active:
+            self.drag_to(self.drag_cursor_pos)
+        return self.scroll_target is not None
+
+    def row_span(self, row: int) -> Tuple[float, float]:
+        # start and length of a row along the scroll axis, in content coordinates
+        if self.flow() == Flow.Grid:
+            return row // self.columnCount() * self.linePitch(), self.cellSize().height()
+        return self.rowStart(row), self.rowPitch(row) - self.spacing()
+
+    def scrollPositionForRow(self, row: int, hint: ScrollHint = ScrollHint.EnsureVisible) -> int:
+        start, length = self.row_span(row)
+        extent = self.width() if self.flow() == Flow.LeftToRight else self.height()
+        value = self.scroll_target if self.scroll_target is not None else self.scroll_bar.value()
+        if hint == ScrollHint.EnsureVisible:
+            if start < value:
+                hint = ScrollHint.PositionAtTop
+            elif start + length > value + extent:
+                hint = ScrollHint.PositionAtBottom
+            else:
+                return int(value)
+        if hint == ScrollHint.PositionAtTop:
+            target = start
+        elif hint == ScrollHint.PositionAtBottom:
+            target = start + length - extent
+        else:
+            target = start + (length - extent) / 2
+        return int(min(max(target, self.scroll_bar.minimum()), self.scroll_bar.maximum()))
+
+    def scrollToRow(self, row: int, hint: ScrollHint = ScrollHint.EnsureVisible, animated: bool = True) -> None:
+        if not self.isRowValid(row):
+            return
+        target = self.scrollPositionForRow(row, hint)
+        if not animated or not self.hasSmoothScrolling():
+            self.scroll_bar.setValue(target)
+            return
+        extent = self.width() if self.flow() == Flow.LeftToRight else self.height()
+        distance = target - self.scroll_bar.value()
+        if abs(distance) > 2 * extent:
+            # jump most of a long distance at once and animate only the last screen
+            self.scroll_bar.setValue(target - int(math.copysign(extent, distance)))
+        self.smooth_scroll_to(target)
+
+    def ensureVisible(self, row: int, animated: bool = True) -> None:
+        self.scrollToRow(row, ScrollHint.EnsureVisible, animated)
+
+    def layout_scroll_bar(self) -> None:
+        if self.flow() == Flow.LeftToRight:
             _rect = QRect(0, 0, self.rect().width(), 8)
             _rect.moveBottom(self.rect().bottom())
-            self.scroll_bar.setGeometry(_rect)
-            self.scroll_bar.setRange(0, self.rowWidth() * len(self.items_by_id) - self.width())
+        else:
+            _rect = QRect(0, 0, 8, self.rect().height())
+            _rect.moveRight(self.rect().right())
+        self.scroll_bar.setGeometry(_rect)
+
+    def resizeEvent(self, event: QResizeEvent) -> None:
+        self.layout_scroll_bar()
+        # the default delegate sizes rows along the horizontal flow from the widget width
+        if self.flow() == Flow.LeftToRight and event.oldSize().width() != event.size().width():
+            self.invalidateItemSizes()
+        else:
+            self.updateScrollRange()
 
     def getIndexRect(self, index: int) -> QRect:
+        if self.flow() == Flow.Grid:
+            position = self.cellPosition(index)
+            return QRect(QPoint(int(position.x()), int(position.y()) - self.scroll_bar.value()), self.cellSize())
         if self.flow() == Flow.TopToBottom:
             x = self.spacing()
-            y = index * self.rowHeight() + self.spacing() * index - self.scroll_bar.value()
+            y = self.rowStart(index) - self.scroll_bar.value()
             w = self.rowWidth()
-            h = self.rowHeight() - self.spacing()
+            h = self.uniformExtent(index) - self.spacing()
         else:
-            x = index * self.rowWidth() - self.scroll_bar.value() + self.spacing() * index
+            x = self.rowStart(index) - self.scroll_bar.value()
             y = self.spacing()
-            w = self.rowWidth()
+            w = self.uniformExtent(index)
             h = self.rowHeight() - self.spacing()
         return QRect(x, y, w, h)
 
-    def addItem(self, item) -> None:
-        item_style = Style(offset=0)
-        item_id = uuid.uuid4()
-        index = Index(item, item_style, item_id)
-        self.items_list.append(index)
-        self.items_by_id[item_id] = index
+    def shiftedIndexRect(self, index: int, offset: float) -> QRect:
+        if self.flow() == Flow.Grid:
+            position = self.cellPosition(index + offset)
+            return QRect(QPoint(int(position.x()), int(position.y()) - self.scroll_bar.value()), self.cellSize())
+        if self.flow() == Flow.TopToBottom:
+            return self.getIndexRect(index).translated(0, int(offset))
+        return self.getIndexRect(index).translated(int(offset), 0)
+
+    def dragIsActive(self) -> bool:
+        return self.inner_drag_is_active or self.reorder_is_active or self.external_drag_source is not None
+
+    def dragGroup(self) -> Optional[str]:
+        return self._drag_group
+
+    def setDragGroup(self, group: Optional[str]) -> None:
+        # rows can be dragged between views of the same group
+        self._drag_group = group
+
+    def addItem(self, item: Item) -> None:
+        self.insertRows(self.rowCount(), [item])
+
+    def addItems(self, items: Iterable[Item]) -> None:
+        self.insertRows(self.rowCount(), items)
+
+    def insertRows(self, row: int, items: Iterable[Item]) -> None:
+        if not 0 <= row <= self.rowCount():
+            raise IndexError(f"row {row} is out of range")
+        if self.dragIsActive():
+            # the drop will move rows around, so the insert remembers the item it goes in front of, or the end
+            anchor_id = self.store.itemId(row) if row < self.rowCount() else None
+            self.pending_mutations.append(partial(self.insert_before_item, anchor_id, list(items)))
+            return
+        previous_count = len(self.store)
+        source_count = len(self.unfiltered_store())
+        inserted_count = self.store.insert(row, items)
+        if inserted_count:
+            self.rows_inserted(row, previous_count, inserted_count)
+            self.rowsChanged()
+        # items a filter hides are still added to the list underneath
+        if len(self.unfiltered_store()) != source_count:
+            self.rowsRearranged.emit()
+
+    def rows_inserted(self, row: int, previous_count: int, inserted_count: int) -> None:
+        for item_id, animated_row in self.offset_rows.items():
+            if animated_row >= row:
+                self.offset_rows[item_id] = animated_row + inserted_count
+        if not self.usesPitchTree():
+            return
+        spacing = self.spacing()
+        new_pitches = [self.itemExtent(new_row) + spacing for new_row in range(row, row + inserted_count)]
+        if row == previous_count and inserted_count < previous_count:
+            for pitch in new_pitches:
+                self.row_pitches.append(pitch)
+        else:
+            # only the new rows are measured, the pitches of the existing ones are spliced around them
+            pitches = self.row_pitches.values
+            pitches[row:row] = new_pitches
+            self.row_pitches.build(pitches)
+
+    def insert_before_item(self, anchor_id: Optional[Hashable], items: List[Item]) -> None:
+        rows = self.rows_of_items((anchor_id,)) if anchor_id is not None else ()
+        self.insertRows(rows[0] if rows else self.rowCount(), items)
+
+    def rows_of_items(self, item_ids: Sequence[Hashable]) -> List[int]:
+        # the current rows of the given items, in the order the ids are given; items that are gone are left out
+        positions = {item_id: position for position, item_id in enumerate(item_ids)}
+        if not positions:
+            return list()
+        found = list()
+        for row in range(self.rowCount()):
+            position = positions.get(self.store.itemId(row))
+            if position is not None:
+                found.append((position, row))
+        found.sort()
+        return [row for _, row in found]
+
+    def removeRows(self, row: int, count: int) -> None:
+        if count <= 0:
+            return
+        if row < 0 or row + count > self.rowCount():
+            raise IndexError(f"rows {row} to {row + count - 1} are out of range")
+        if self.dragIsActive():
+            item_ids = [self.store.itemId(removed_row) for removed_row in range(row, row + count)]
+            self.pending_mutations.append(partial(self.remove_items, item_ids))
+            return
+        self.rows_removed(row, count, self.store.remove(row, count))
+        self.rowsChanged()
+        self.rowsRearranged.emit()
+
+    def remove_items(self, item_ids: List[Hashable]) -> None:
+        # the drop may have split the block, so it is removed back to front in runs of adjacent rows
+        rows = sorted(self.rows_of_items(item_ids))
+        end = len(rows)
+        while end > 0:
+            start = end - 1
+            while start > 0 and rows[start - 1] == rows[start] - 1:
+                start -= 1
+            self.removeRows(rows[start], end - start)
+            end = start
+
+    def rows_removed(self, row: int, count: int, removed_ids: List[Hashable]) -> None:
+        self.forget_items(removed_ids)
+        for item_id, animated_row in self.offset_rows.items():
+            if animated_row >= row + count:
+                self.offset_rows[item_id] = animated_row - count
+        if self.usesPitchTree():
+            pitches = self.row_pitches.values
+            del pitches[row:row + count]
+            self.row_pitches.build(pitches)
+
+    def forget_items(self, removed_ids: List[Hashable]) -> None:
+        for item_id in removed_ids:
+            self.item_extents.pop(item_id, None)
+            if self.async_renderer is not None:
+                self.async_renderer.cancel(item_id)
+            if self.render_cache is not None:
+                self.render_cache.invalidate(item_id)
+            self.stop_offset_animation(item_id)
+            self.shifted_item_ids.discard(item_id)
+            self.selected_ids.discard(item_id)
+
+    def moveRows(self, source_row: int, count: int, destination_row: int) -> None:
+        # destination_row follows QAbstractItemModel.moveRows: the row the block is inserted before
+        if count <= 0:
+            return
+        if source_row < 0 or source_row + count > self.rowCount() or not 0 <= destination_row <= self.rowCount():
+            raise IndexError(f"cannot move rows {source_row} to {source_row + count - 1} before row {destination_row}")
+        if self.dragIsActive():
+            item_ids = [self.store.itemId(row) for row in range(source_row, source_row + count)]
+            anchor_id = self.store.itemId(destination_row) if destination_row < self.rowCount() else None
+            self.pending_mutations.append(partial(self.move_items, item_ids, anchor_id))
+            return
+        if source_row <= destination_row <= source_row + count:
+            return
+        if destination_row > source_row:
+            destination_row -= count
+        self.store.move(source_row, count, destination_row)
+        for item_id, animated_row in self.offset_rows.items():
+            if source_row <= animated_row < source_row + count:
+                self.offset_rows[item_id] = destination_row + animated_row - source_row
+                continue
+            if animated_row >= source_row + count:
+                animated_row -= count
+            self.offset_rows[item_id] = animated_row + count if animated_row >= destination_row else animated_row
+        if self.usesPitchTree():
+            pitches = self.row_pitches.values
+            pitch_block = pitches[source_row:source_row + count]
+            del pitches[source_row:source_row + count]
+            pitches[destination_row:destination_row] = pitch_block
+            self.row_pitches.build(pitches)
+        self.rowsChanged()
+        self.rowsRearranged.emit()
+
+    def applyOrder(self, order: Sequence[int], animated: bool = True) -> None:
+        # order[new_row] is the row the item previously occupied
+        self.ensure_not_model_backed("reordering")
+        if self.dragIsActive():
+            self.pending_mutations.append(partial(self.applyOrder, list(order), animated))
+            return
+        self.check_order(order, self.rowCount())
+        for item_id in self.shifted_item_ids:
+            self.stop_offset_animation(item_id)
+        self.store.resetOffsets(self.shifted_item_ids)
+        self.shifted_item_ids.clear()
+
+        # the old layout is kept aside so rows can start from where they were drawn
+        old_pitches = self.row_pitches
+        self.store.permute(order)
+        if self.usesPitchTree():
+            self.row_pitches = FenwickTree(old_pitches.values[row] for row in order)
+        self.selection_anchor_row = None
+        self.rowsChanged()
+        self.orderChanged.emit(list(order))
+        if not animated:
+            return
+
+        # FLIP: rows that end up on screen are offset back to their old position and animate to the new one,
+        # everything else simply takes its new place
+        pitch = self.defaultPitch()
+
+        def old_start(row: int) -> float:
+            return old_pitches.prefix(row) if self.usesPitchTree() else row * pitch
+
+        if self.flow() == Flow.Grid:
+            low, high = self.visibleRowRange()
+            low, high = low - self.columnCount(), high + self.columnCount()
+        else:
+            extent = self.width() if self.flow() == Flow.LeftToRight else self.height()
+            low = self.scroll_bar.value() - self.defaultPitch()
+            high = self.scroll_bar.value() + extent
+        first, last = self.visibleRowRange()
+        for row in range(first, last):
+            # rows coming from far away enter from just outside the viewport
+            start = min(max(old_start(order[row]), low), high)
+            offset = start - self.rowStart(row)
+            if offset:
+                self.store.setOffset(self.store.itemId(row), offset)
+                self.start_offset_animation(row, 0)
+
+    def check_order(self, order: Sequence[int], count: int) -> None:
+        if len(order) != count or len(set(order)) != count or (count and (min(order) < 0 or max(order) >= count)):
+            raise ValueError("order must be a permutation of the current rows")
+
+    def orderIds(self) -> array:
+        # the order of the whole list, rows hidden by a filter included
+        return self.unfiltered_store().stableIds()
+
+    def setOrderIds(self, ids: Sequence[int]) -> None:
+        store = self.unfiltered_store()
+        rows_by_id = {store.stableId(row): row for row in range(len(store))}
+        try:
+            order = [rows_by_id[item_id] for item_id in ids]
+        except KeyError as error:
+            raise ValueError(f"unknown id {error.args[0]} in saved order") from None
+        if store is self.store:
+            self.applyOrder(order, animated=False)
+        else:
+            self.apply_source_order(order)
+
+    def apply_source_order(self, order: Sequence[int]) -> None:
+        # a filtered view reorders the whole list underneath and then picks its visible rows from it again
+        if self.dragIsActive():
+            self.pending_mutations.append(partial(self.apply_source_order, list(order)))
+            return
+        source = self.unfiltered_store()
+        self.check_order(order, len(source))
+        source.permute(order)
+        self.store.refilter()
+        self.filter_changed()
+        self.orderChanged.emit(list(order))
+
+    def sortBy(self, key: Callable[[Item], object], reverse: bool = False, animated: bool = True) -> None:
+        self.ensure_not_model_backed("reordering")
+        store = self.store
+        order = sorted(range(self.rowCount()), key=lambda row: key(store.item(row)), reverse=reverse)
+        self.applyOrder(order, animated)
+
+    def setItem(self, row: int, item: Item) -> None:
+        if not 0 <= row < self.rowCount():
+            raise IndexError(f"row {row} is out of range")
+        if self.dragIsActive():
+            self.pending_mutations.append(partial(self.set_item_by_id, self.store.itemId(row), item))
+            return
+        self.store.setItem(row, item)
+        self.updateItemSize(row)
+
+    def set_item_by_id(self, item_id: Hashable, item: Item) -> None:
+        rows = self.rows_of_items((item_id,))
+        if rows:
+            self.setItem(rows[0], item)
+
+    def setModel(self, model: Optional[QAbstractItemModel]) -> None:
+        if self.model_adapter is not None:
+            self.model_adapter.detach()
+            self.model_adapter.deleteLater()
+            self.model_adapter = None
+        self.removeRows(0, self.rowCount())
+        if model is not None:
+            if isinstance(self.store, FilteredItemStore):
+                self.store = self.store.sourceStore()
+                self.filter_changed()
+            self.model_adapter = ModelAdapter(self, model)
+
+    def model(self) -> Optional[QAbstractItemModel]:
+        if self.model_adapter is None:
+            return None
+        return self.model_adapter.model
+
+    def move_items(self, item_ids: List[Hashable], anchor_id: Optional[Hashable]) -> None:
+        rows = self.rows_of_items(item_ids)
+        if not rows:
+            return
+        anchor_rows = self.rows_of_items((anchor_id,)) if anchor_id is not None else ()
+        destination_row = anchor_rows[0] if anchor_rows else self.rowCount()
+        if rows == list(range(rows[0], rows[0] + len(rows))):
+            self.moveRows(rows[0], len(rows), destination_row)
+            return
+        # the drop split the block: put its rows back together in front of the anchor
+        moved_rows = set(rows)
+        order = [row for row in range(destination_row) if row not in moved_rows] + rows
+        order.extend(row for row in range(destination_row, self.rowCount()) if row not in moved_rows)
+        self.applyOrder(order, animated=False)
+
+    def rowsChanged(self) -> None:
+        # a pending press refers to a row index that may no longer hold the same item
+        self.drag_is_armed = False
+        self.updateScrollRange()
         self.update()
 
+    def flushPendingMutations(self) -> None:
+        pending_mutations, self.pending_mutations = self.pending_mutations, list()
+        for mutation in pending_mutations:
+            mutation()
+
     def indexAt(self, pos: QPoint) -> int:
+        if self.flow() == Flow.Grid:
+            x = pos.x() - self.spacing()
+            y = pos.y() + self.scroll_bar.value()
+            column = int(x // (self.cellSize().width() + self.spacing()))
+            if x < 0 or y < 0 or column >= self.columnCount():
+                return -1
+            return min(int(y // self.linePitch()) * self.columnCount() + column, self.rowCount())
         if self.flow() == Flow.TopToBottom:
-            index = (pos.y() + self.scroll_bar.value()) // self.rowHeight()
+            position = pos.y() + self.scroll_bar.value()
         else:
-            index = (pos.x() + self.scroll_bar.value()) // self.rowWidth()
-        return int(index)
+            position = pos.x() + self.scroll_bar.value()
+        return self.rowAtPosition(position)
+
+    def visibleRowRange(self) -> Tuple[int, int]:
+        if self.flow() == Flow.Grid:
+            columns = self.columnCount()
+            line_pitch = self.linePitch()
+            if line_pitch <= 0:
+                return 0, self.rowCount()
+            margin_lines = math.ceil(self.dragged_pitch_prefix[-1] / columns)
+            first_line = max(0, int(self.scroll_bar.value() // line_pitch) - margin_lines)
+            last_line = int((self.scroll_bar.value() + self.height()) // line_pitch) + margin_lines + 1
+            return min(self.rowCount(), first_line * columns), min(self.rowCount(), last_line * columns)
+        if self.flow() == Flow.TopToBottom:
+            extent = self.height()
+        else:
+            extent = self.width()
+        # an offset animation shifts a row by at most the dragged block's pitch, so widen the window by that much
+        margin = self.dragged_pitch_prefix[-1]
+        first = max(0, self.rowAtPosition(max(0, self.scroll_bar.value() - margin)))
+        last = min(self.rowCount(), self.rowAtPosition(self.scroll_bar.value() + extent + margin) + 1)
+        return first, last
 
     def rowCount(self) -> int:
-        return len(self.items_by_id)
+        return len(self.store)
 
     def isRowValid(self, row: int) -> bool:
         return 0 <= row < self.rowCount()
 
     def replace_item(self, from_index: int, to_index: int) -> None:
-        item_to_be_moved = self.items_by_id.pop(from_index)
-        item_style_to_be_moved = self.items_style.pop(from_index)
-        self.items_by_id.insert(to_index, item_to_be_moved)
-        self.items_style.insert(to_index, item_style_to_be_moved)
+        self.moveRows(from_index, 1, to_index + 1 if to_index > from_index else to_index)
+
+    def selectedRows(self) -> List[int]:
+        if not self.selected_ids:
+            return list()
+        return [row for row in range(self.rowCount()) if self.store.itemId(row) in self.selected_ids]
+
+    def isRowSelected(self, row: int) -> bool:
+        return self.store.itemId(row) in self.selected_ids
+
+    def setRowSelected(self, row: int, selected: bool) -> None:
+        if selected:
+            self.selected_ids.add(self.store.itemId(row))
+        else:
+            self.selected_ids.discard(self.store.itemId(row))
+        self.selection_anchor_row = row
+        self.selectionChanged.emit()
+        self.update(self.row_rect(row))
+
+    def selectRange(self, first_row: int, last_row: int) -> None:
+        if first_row > last_row:
+            first_row, last_row = last_row, first_row
+        self.selected_ids = {self.store.itemId(row) for row in range(first_row, last_row + 1)}
+        self.selectionChanged.emit()
+        self.update()
+
+    def clearSelection(self) -> None:
+        self.selected_ids.clear()
+        self.selection_anchor_row = None
+        self.selectionChanged.emit()
+        self.update()
+
+    def selectOnly(self, row: int) -> None:
+        self.selected_ids = {self.store.itemId(row)}
+        self.selection_anchor_row = row
+        self.selectionChanged.emit()
+        self.update()
 
     def mousePressEvent(self, event: QMouseEvent) -> None:
         super().mousePressEvent(event)
         if self.reorder_is_active:
             return
         index = self.indexAt(event.position())
-        if not 0 <= index < len(self.items_by_id):
+        if not self.isRowValid(index):
             return
         if event.button() == Qt.LeftButton:
-            self.inner_drag_is_active = True
+            modifiers = event.modifiers()
+            if modifiers & Qt.KeyboardModifier.ShiftModifier:
+                anchor = self.selection_anchor_row
+                if anchor is None or not self.isRowValid(anchor):
+                    anchor = index
+                self.selectRange(anchor, index)
+                return
+            if modifiers & Qt.KeyboardModifier.ControlModifier:
+                self.setRowSelected(index, not self.isRowSelected(index))
+                return
+            # pressing inside a multi-selection keeps it so the whole selection can be dragged
+            if not (self.isRowSelected(index) and len(self.selected_ids) > 1):
+                self.selectOnly(index)
+            self.drag_is_armed = True
+            self.pressed_row = index
             self.inner_drag_start_position = event.pos()
-            self.dragged_item = self.items_list[index].item
-            self.dragged_item_style = self.items_list[index].item_style
-            self.dragged_item_row = index
-            self.current_drop_row = index
-            self.current_shift_value = self.dragged_item_row
+            self.inner_drag_start_scroll = self.scroll_bar.value()
+            self.drag_cursor_pos = event.position()
+
+    def begin_drag(self) -> None:
+        pressed_row = self.pressed_row
+        if self.isRowSelected(pressed_row) and len(self.selected_ids) > 1:
+            self.dragged_rows = self.selectedRows()
+        else:
+            self.dragged_rows = [pressed_row]
+        self.dragged_row_set = set(self.dragged_rows)
+        self.dragged_pitch_prefix = [0]
+        for row in self.dragged_rows:
+            self.dragged_pitch_prefix.append(self.dragged_pitch_prefix[-1] + self.rowPitch(row))
+
+        self.drag_is_armed = False
+        self.inner_drag_is_active = True
+        self.dragged_item = self.store.item(pressed_row)
+        self.dragged_item_style = self.store.itemStyle(pressed_row)
+        self.dragged_item_row = pressed_row
+        self.current_drop_row = pressed_row - self.dragged_before(pressed_row)
+        self.drag_base_slot = self.current_drop_row
+        self.current_shift_value = 0
+        self.dragged_snapshot(pressed_row, self.getIndexRect(pressed_row))
+        for row in self.dragged_rows:
+            self.update(self.row_rect(row))
+
+        # close the gaps between the selected rows around the pressed one
+        for row in range(self.dragged_rows[0] + 1, self.dragged_rows[-1]):
+            if row not in self.dragged_row_set:
+                self.start_offset_animation(row, self.target_offset(row))
+
+    def dragged_before(self, row: int) -> int:
+        return bisect_left(self.dragged_rows, row)
+
+    def dragged_pitch_before(self, row: int) -> float:
+        return self.dragged_pitch_prefix[self.dragged_before(row)]
+
+    def row_of_rank(self, rank: int) -> int:
+        # row of the rank-th row that is not being dragged
+        row = rank
+        for dragged_row in self.dragged_rows:
+            if dragged_row <= row:
+                row += 1
+            else:
+                break
+        return row
+
+    def dropRowAt(self, position: float) -> int:
+        # number of rows left behind by the drag whose midpoint, with the dragged rows taken out, lies before position
+        low, high = 0, self.rowCount()
+        while low < high:
+            row = (low + high) // 2
+            midpoint = self.rowStart(row) - self.dragged_pitch_before(row)
+            if row not in self.dragged_row_set:
+                midpoint += self.rowPitch(row) / 2
+            if midpoint <= position:
+                low = row + 1
+            else:
+                high = row
+        return low - self.dragged_before(low)
+
+    def dropPosition(self, drop_row: int) -> float:
+        if drop_row >= self.rowCount() - len(self.dragged_rows):
+            return self.contentExtent() - self.dragged_pitch_prefix[-1]
+        row = self.row_of_rank(drop_row)
+        return self.rowStart(row) - self.dragged_pitch_before(row)
+
+    def get_grid_shift_value(self, cursor_pos: QPointF) -> float:
+        diff = QPointF(cursor_pos) - QPointF(self.inner_drag_start_position)
+        base_position = self.cellPosition(self.drag_base_slot)
+        self.dragged_point = base_position + diff - QPointF(0, self.inner_drag_start_scroll)
+        cell_size = self.cellSize()
+        center = (base_position + diff + QPointF(cell_size.width() / 2, cell_size.height() / 2)
+                  + QPointF(0, self.scroll_bar.value() - self.inner_drag_start_scroll))
+        columns = self.columnCount()
+        column = int((center.x() - self.spacing()) // (cell_size.width() + self.spacing()))
+        column = min(max(column, 0), columns - 1)
+        line = math.floor(center.y() / self.linePitch())
+        # in slot space every row is one unit long, so the slot under the block's centre is where it drops
+        return self.dropRowAt(line * columns + column) - self.current_drop_row
 
     def get_shift_value(self, cursor_pos: QPoint) -> float:
+        if self.flow() == Flow.Grid:
+            return self.get_grid_shift_value(cursor_pos)
         if self.flow() == Flow.TopToBottom:
-            y_diff = cursor_pos.y() - self.inner_drag_start_position.y()
-            self.dragged_pos = y_diff + self.dragged_item_row * self.rowHeight() - self.scroll_bar.value()
-            new_shift_value = int((y_diff + self.rowHeight() // 2) // self.rowHeight())
+            diff = cursor_pos.y() - self.inner_drag_start_position.y()
         else:
-            x_diff = cursor_pos.position().x() - self.inner_drag_start_position.x()
-            self.dragged_pos = x_diff + self.dragged_item_row * self.rowWidth() - self.scroll_bar.value()
-            new_shift_value = int((x_diff + self.rowWidth() // 2) // self.rowWidth())
-        return new_shift_value
+            diff = cursor_pos.x() - self.inner_drag_start_position.x()
+        pressed_row = self.dragged_item_row
+        start = self.rowStart(pressed_row) - self.dragged_pitch_before(pressed_row)
+        self.dragged_pos = diff + start - self.inner_drag_start_scroll
+        content_diff = diff + self.scroll_bar.value() - self.inner_drag_start_scroll
+        return self.dropRowAt(start + content_diff) - self.current_drop_row
 
     def mouseMoveEvent(self, event: QMouseEvent) -> None:
         super().mouseMoveEvent(event)
         if self.reorder_is_active:
             return
+        if self.drag_is_armed:
+            distance = (event.pos() - self.inner_drag_start_position).manhattanLength()
+            if distance >= QApplication.startDragDistance():
+                self.begin_drag()
         if self.inner_drag_is_active:
-            new_shift_value = self.get_shift_value(event.position())
-            new_drop_row = new_shift_value + self.dragged_item_row
+            if self.frame_stats is not None and self.pending_input_time is None:
+                self.pending_input_time = time.perf_counter()
+            self.drag_cursor_pos = event.position()
+            self.drag_to(self.drag_cursor_pos)
+            if (self.hasAutoScroll() and self.external_drop_target is None and self.auto_scroll_velocity() != 0
+                    and not self.clock.isDriving("autoscroll")):
+                self.auto_scroll_remainder = 0
+                self.clock.drive("autoscroll", self.auto_scroll_tick)
+
+    def drag_to(self, cursor_pos: QPoint) -> None:
+        previous_bounds = self.dragged_block_bounds()
+        new_shift_value = self.get_shift_value(cursor_pos)
+        target = self.drop_target_at(cursor_pos)
+        if target is not self.external_drop_target:
+            if self.external_drop_target is not None:
+                self.external_drop_target.external_drag_left()
+            self.external_drop_target = target
+            if target is not None:
+                target.external_drag_entered(self)
+        if target is not None:
+            # while over another view the rows keep their place here in case they are not dropped there
+            new_drop_row = self.drag_base_slot
+            target.external_drag_moved()
+        else:
+            new_drop_row = new_shift_value + self.current_drop_row
             if new_drop_row < 0:
                 new_drop_row = 0
-            if new_drop_row >= self.rowCount():
-                new_drop_row = self.rowCount()-1
-            if new_drop_row != self.current_drop_row:
-                previous_drop_row = self.current_drop_row
-                self.current_drop_row = new_drop_row
-                if self.current_drop_row < previous_drop_row:
-                    if self.current_drop_row >= self.dragged_item_row:
-                        animated_row = self.current_drop_row + 1
-                        end_value = 0
-                    else:
-                        animated_row = self.current_drop_row
-                        if self.flow() == Flow.TopToBottom:
-                            end_value = self.rowHeight() + self.spacing()
-                        else:
-                            end_value = self.rowWidth() + self.spacing()
-                else:
-                    if self.current_drop_row <= self.dragged_item_row:
-                        animated_row = self.current_drop_row - 1
-                        end_value = 0
-                    else:
-                        animated_row = self.current_drop_row
-                        if self.flow() == Flow.TopToBottom:
-                            end_value = -(self.rowHeight() + self.spacing())
-                        else:
-                            end_value = -(self.rowWidth() + self.spacing())
-
-                self.start_offset_animation(animated_row, end_value)
+            if new_drop_row > self.rowCount() - len(self.dragged_rows):
+                new_drop_row = self.rowCount() - len(self.dragged_rows)
+        self.update_drop_row(new_drop_row)
+        self.update(previous_bounds)
+        self.update(self.dragged_block_bounds())
 
-            self.update()
+    def drop_target_at(self, cursor_pos: QPointF) -> Optional["DraggableListView"]:
+        point = QPointF(cursor_pos).toPoint()
+        if self._drag_group is None or self.rect().contains(point):
+            return None
+        widget = QApplication.widgetAt(self.mapToGlobal(point))
+        while widget is not None and not isinstance(widget, DraggableListView):
+            widget = widget.parentWidget()
+        if widget is not None and widget.accepts_drag_from(self):
+            return widget
+        return None
+
+    def accepts_drag_from(self, source: "DraggableListView") -> bool:
+        # model-backed views own their rows through the model, so they take no part in moves by reference
+        return (self is not source and self._drag_group is not None and self._drag_group == source.dragGroup()
+                and self.model() is None and source.model() is None
+                and (self.external_drag_source is source or not self.dragIsActive()))
+
+    def incoming_pitch(self, item: Item) -> float:
+        if not self.usesPitchTree():
+            return self.defaultPitch()
+        size = self.item_size_hint(item)
+        return (size.height() if self.flow() == Flow.TopToBottom else size.width()) + self.spacing()
+
+    def external_origin(self) -> QPoint:
+        return self.mapFromGlobal(self.external_drag_source.mapToGlobal(QPoint(0, 0)))
+
+    def external_block_rect(self) -> QRect:
+        source = self.external_drag_source
+        rect = QRect()
+        for index, row in enumerate(source.dragged_rows):
+            rect = rect.united(source.dragged_block_rect(index, row))
+        return rect.translated(self.external_origin())
+
+    def external_drop_row(self) -> int:
+        rect = self.external_block_rect()
+        if self.flow() == Flow.Grid:
+            cell_size = self.cellSize()
+            center = rect.topLeft() + QPoint(cell_size.width() // 2, cell_size.height() // 2)
+            column = int((center.x() - self.spacing()) // (cell_size.width() + self.spacing()))
+            column = min(max(column, 0), self.columnCount() - 1)
+            line = max(0, math.floor((center.y() + self.scroll_bar.value()) / self.linePitch()))
+            return min(line * self.columnCount() + column, self.rowCount())
+        position = rect.top() if self.flow() == Flow.TopToBottom else rect.left()
+        return min(max(self.dropRowAt(position + self.scroll_bar.value()), 0), self.rowCount())
+
+    def external_drag_entered(self, source: "DraggableListView") -> None:
+        self.external_drag_source = source
+        self.dragged_rows = list()
+        self.dragged_row_set = set()
+        self.dragged_pitch_prefix = [0]
+        for row in source.dragged_rows:
+            self.dragged_pitch_prefix.append(self.dragged_pitch_prefix[-1] + self.incoming_pitch(source.store.item(row)))
+        self.current_drop_row = self.external_drop_row()
+        # the pointer is grabbed by the source, so this view cannot scroll and only rows on screen need to open the gap
+        first, last = self.visibleRowRange()
+        for row in range(max(first, self.current_drop_row), last):
+            self.start_offset_animation(row, self.target_offset(row))
+        self.external_block_bounds = QRect()
+
+    def external_drag_moved(self) -> None:
+        self.update_drop_row(self.external_drop_row())
+        bounds = self.external_drag_source.dragged_block_bounds().translated(self.external_origin())
+        self.update(self.external_block_bounds)
+        self.update(bounds)
+        self.external_block_bounds = bounds
+
+    def external_drag_left(self) -> None:
+        self.external_drag_source = None
+        self.current_drop_row = None
+        closed_ids = set()
+        first, last = self.visibleRowRange()
+        for row in range(first, last):
+            item_id = self.store.itemId(row)
+            if item_id in self.shifted_item_ids:
+                self.start_offset_animation(row, 0)
+                closed_ids.add(item_id)
+        hidden_ids = self.shifted_item_ids - closed_ids
+        for item_id in hidden_ids:
+            self.stop_offset_animation(item_id)
+        self.store.resetOffsets(hidden_ids)
+        self.shifted_item_ids = closed_ids
+        self.update(self.external_block_bounds)
+        self.external_block_bounds = QRect()
+        self.flushPendingMutations()
+
+    def take_dragged_rows(self, as_indexes: bool) -> List[Union[Index, Item]]:
+        rows = self.dragged_rows
+        self.clock.stopDriving("autoscroll")
+        for item_id in self.shifted_item_ids:
+            self.stop_offset_animation(item_id)
+        self.store.resetOffsets(self.shifted_item_ids)
+        self.shifted_item_ids.clear()
+        records = list()
+        # back to front in runs of adjacent rows, so each store call removes one slice
+        end = len(rows)
+        while end > 0:
+            start = end - 1
+            while start > 0 and rows[start - 1] == rows[start] - 1:
+                start -= 1
+            first, count = rows[start], end - start
+            if as_indexes:
+                indexes = self.store.takeIndexes(first, count)
+                removed_ids = [index.item_id for index in indexes]
+                records[0:0] = indexes
+            else:
+                records[0:0] = [self.store.item(row) for row in range(first, first + count)]
+                removed_ids = self.store.remove(first, count)
+            self.forget_items(removed_ids)
+            end = start
+        if self.usesPitchTree():
+            # one rebuild for the whole block instead of one per run of adjacent rows
+            taken_rows = set(rows)
+            self.row_pitches.build(pitch for row, pitch in enumerate(self.row_pitches.values) if row not in taken_rows)
+        self.selection_anchor_row = None
+        self.reset_drag_state()
+        self.rowsChanged()
+        self.rowsRearranged.emit()
+        self.flushPendingMutations()
+        return records
+
+    def accept_external_drop(self, source: "DraggableListView") -> None:
+        drop_row = self.current_drop_row
+        source_rows = list(source.dragged_rows)
+        gap = self.dragged_pitch_prefix[-1]
+        block_rect = self.external_block_rect()
+        block_position = block_rect.top() if self.flow() == Flow.TopToBottom else block_rect.left()
+
+        # rows that made room keep their place on screen: the inserted rows take over the gap they opened
+        shifted = list()
+        first, last = self.visibleRowRange()
+        for row in range(first, last):
+            item_id = self.store.itemId(row)
+            if item_id in self.shifted_item_ids:
+                offset = self.store.offset(row)
+                shifted.append((row, item_id, offset - gap if row >= drop_row else offset))
+        for item_id in self.shifted_item_ids:
+            self.stop_offset_animation(item_id)
+        self.store.resetOffsets(self.shifted_item_ids)
+        self.shifted_item_ids.clear()
+
+        # Index records move by reference when both views use the default store, otherwise the items do
+        as_indexes = type(self.store) is ItemStore and type(source.store) is ItemStore
+        records = source.take_dragged_rows(as_indexes)
+        previous_count = len(self.store)
+        if as_indexes:
+            inserted_count = self.store.insertIndexes(drop_row, records)
+        else:
+            inserted_count = self.store.insert(drop_row, records)
+        self.rows_inserted(drop_row, previous_count, inserted_count)
+        self.external_drag_source = None
+        self.current_drop_row = None
+
+        for row, item_id, offset in shifted:
+            row = row + inserted_count if row >= drop_row else row
+            self.store.setOffset(item_id, offset)
+            self.start_offset_animation(row, 0)
+        if self.flow() != Flow.Grid and inserted_count:
+            # the dropped rows glide from where the block was released into their slots
+            offset = block_position + self.scroll_bar.value() - self.rowStart(drop_row)
+            for row in range(drop_row, drop_row + inserted_count):
+                self.store.setOffset(self.store.itemId(row), offset)
+                self.start_offset_animation(row, 0)
+
+        self.selected_ids = {self.store.itemId(row) for row in range(drop_row, drop_row + inserted_count)}
+        self.selection_anchor_row = drop_row
+        self.external_block_bounds = QRect()
+        self.rowsChanged()
+        self.rowsRearranged.emit()
+        self.selectionChanged.emit()
+        self.rowsDropped.emit(source, source_rows, drop_row)
+        self.flushPendingMutations()
+
+    def auto_scroll_velocity(self) -> float:
+        if self.flow() == Flow.LeftToRight:
+            position, extent = self.drag_cursor_pos.x(), self.width()
+        else:
+            position, extent = self.drag_cursor_pos.y(), self.height()
+        margin = self.autoScrollMargin()
+        if margin <= 0:
+            return 0
+        if position < margin:
+            depth = -min(1.0, (margin - position) / margin)
+        elif position > extent - margin:
+            depth = min(1.0, (position - extent + margin) / margin)
+        else:
+            return 0
+        return depth * self.autoScrollSpeed()
+
+    def auto_scroll_tick(self, delta: int) -> bool:
+        if not self.inner_drag_is_active or not self.hasAutoScroll() or self.external_drop_target is not None:
+            return False
+        velocity = self.auto_scroll_velocity()
+        if velocity == 0:
+            return False
+        self.auto_scroll_remainder += velocity * delta / 1000
+        step = int(self.auto_scroll_remainder)
+        if step == 0:
+            return True
+        self.auto_scroll_remainder -= step
+        value = self.scroll_bar.value()
+        self.scroll_bar.setValue(value + step)
+        if self.scroll_bar.value() == value:
+            return False
+        # the cursor stands still while the content moves under it, so only the drop row needs refreshing
+        self.drag_to(self.drag_cursor_pos)
+        return True
+
+    def target_offset(self, row: int) -> float:
+        # rows after dragged ones close their slots, rows at or after the drop row open a gap for the block
+        offset = -self.dragged_pitch_before(row)
+        if row - self.dragged_before(row) >= self.current_drop_row:
+            offset += self.dragged_pitch_prefix[-1]
+        return offset
+
+    def update_drop_row(self, new_drop_row: int) -> None:
+        previous_drop_row = self.current_drop_row
+        if new_drop_row == previous_drop_row:
+            return
+        self.current_drop_row = new_drop_row
+        # only rows ranked between the old and new drop rows change side of the gap, even when the pointer skipped several rows
+        low, high = min(previous_drop_row, new_drop_row), max(previous_drop_row, new_drop_row)
+        row = self.row_of_rank(low)
+        for _ in range(high - low):
+            while row in self.dragged_row_set:
+                row += 1
+            self.start_offset_animation(row, self.target_offset(row))
+            row += 1
 
     def mouseReleaseEvent(self, event: QMouseEvent) -> None:
         super().mouseReleaseEvent(event)
-        if self.reorder_is_active:
+        if self.drag_is_armed:
+            # a plain click inside a multi-selection narrows it to the clicked row
+            self.drag_is_armed = False
+            self.selectOnly(self.pressed_row)
+            return
+        if self.reorder_is_active or not self.inner_drag_is_active:
+            return
+        target = self.external_drop_target
+        if target is not None:
+            self.external_drop_target = None
+            target.accept_external_drop(self)
             return
         self.inner_drag_is_active = False
         self.reorder_is_active = True
-        if self.flow() == Flow.TopToBottom:
-            destination = self.getIndexRect(self.current_drop_row).y()
-        else:
-            destination = self.getIndexRect(self.current_drop_row).x()
-        self.reorder_animation = QVariantAnimation(self)
+        self.clock.stopDriving("autoscroll")
+        if self.flow() == Flow.Grid:
+            self.drag_release_point = QPointF(self.dragged_point)
+            destination = self.cellPosition(self.current_drop_row) - QPointF(0, self.scroll_bar.value())
+            self.start_reorder_animation(self.drag_release_point, destination)
+            return
+        destination = self.dropPosition(self.current_drop_row) - self.scroll_bar.value()
         start_value = float(self.dragged_pos)
         end_value = float(destination)
         self.start_reorder_animation(start_value, end_value)
 
+    def block_order(self, rows: List[int], drop_row: int) -> List[int]:
+        dragged_row_set = set(rows)
+        remaining = [row for row in range(self.rowCount()) if row not in dragged_row_set]
+        return remaining[:drop_row] + rows + remaining[drop_row:]
+
+    def block_moves(self, rows: List[int], drop_row: int) -> List[Tuple[int, int]]:
+        # the block permutation expressed as single-row moves, each relative to the order left by the previous one
+        if drop_row >= self.rowCount() - len(rows):
+            anchor_row = self.rowCount()
+        else:
+            anchor_row = self.row_of_rank(drop_row)
+        anchor_before = bisect_left(rows, anchor_row)
+        moves = list()
+        for moved, row in enumerate(rows):
+            anchor_position = anchor_row - anchor_before + max(0, anchor_before - moved) + moved
+            position = row if anchor_row < row else row - moved
+            to_row = anchor_position if anchor_position < position else anchor_position - 1
+            if position != to_row:
+                moves.append((position, to_row))
+        return moves
+
+    def block_model_moves(self, rows: List[int], drop_row: int) -> List[Tuple[int, int, int]]:
+        first, count = rows[0], len(rows)
+        if rows[-1] - first + 1 == count:
+            if drop_row == first:
+                return []
+            return [(first, count, drop_row + count if drop_row > first else drop_row)]
+        return [(from_row, 1, to_row + 1 if to_row > from_row else to_row)
+                for from_row, to_row in self.block_moves(rows, drop_row)]
+
     def start_offset_animation(self, row: int, end_value: float):
-        animation = QVariantAnimation(self)
-        animation.setDuration(400)
-        animation.setEasingCurve(QEasingCurve.Type.OutSine)
-        item_index: Index = self.items_list[row]
-        item_id = item_index.item_id
-        animation.setStartValue(item_index.item_style.offset)
-        animation.setEndValue(end_value)
-
-        def value_changed(new_value):
-            self.items_by_id[item_id].item_style.offset = new_value
-            self.update()
+        item_id = self.store.itemId(row)
+        self.shifted_item_ids.add(item_id)
+        duration = 400
+        if self.render_quality == RenderQuality.Reduced:
+            if not self.row_rect(row).united(self.shiftedIndexRect(row, end_value)).intersects(self.rect()):
+                # nobody sees this row move, so it goes straight to where it is heading
+                self.stop_offset_animation(item_id)
+                self.set_row_offset(row, item_id, end_value)
+                return
+            duration = 200
+        self.offset_rows[item_id] = row
+        self.clock.animate(("offset", item_id), self.store.offset(row), end_value,
+                           duration, QEasingCurve.Type.OutSine, partial(self.offset_tween_step, item_id),
+                           partial(self.offset_rows.pop, item_id, None))
 
-        animation.valueChanged.connect(value_changed)
-        if row in self.animation_map:
-            current_animation: QVariantAnimation = self.animation_map[row]
-            if current_animation.state() == QAbstractAnimation.Running:
-                current_animation.stop()
-        self.animation_map[row] = animation
-        self.animation = animation
-        self.animation.start()
-
-    def start_reorder_animation(self, start_value: float, end_value: float):
-        self.reorder_animation.setStartValue(start_value)
-        self.reorder_animation.setEndValue(end_value)
-        self.reorder_animation.setDuration(400)
-        self.reorder_animation.setEasingCurve(QEasingCurve.Type.InOutSine)
-
-        def update_value(new_value: float):
-            self.dragged_pos = new_value
-            self.update()
+    def stop_offset_animation(self, item_id: Hashable) -> None:
+        self.clock.stop(("offset", item_id))
+        self.offset_rows.pop(item_id, None)
+
+    def offset_tween_step(self, item_id: Hashable, value: float) -> None:
+        self.set_row_offset(self.offset_rows[item_id], item_id, value)
+
+    def set_row_offset(self, row: int, item_id: Hashable, value: float) -> None:
+        previous_rect = self.row_rect(row)
+        self.store.setOffset(item_id, value)
+        self.update(previous_rect.united(self.shiftedIndexRect(row, value)))
 
-        self.reorder_animation.valueChanged.connect(update_value)
+    def start_reorder_animation(self, start_value: Union[float, QPointF], end_value: Union[float, QPointF]):
+        def update_value(progress: float):
+            previous_bounds = self.dragged_block_bounds()
+            self.drop_progress = progress
+            if self.flow() == Flow.Grid:
+                self.dragged_point = start_value + (end_value - start_value) * progress
+            else:
+                self.dragged_pos = start_value + (end_value - start_value) * progress
+            self.update(previous_bounds)
+            self.update(self.dragged_block_bounds())
 
         def finished():
-            item_to_be_moved = self.items_list.pop(self.dragged_item_row)
-            for row in range(len(self.items_list)):
-                self.items_list[row].item_style.offset = 0
-            self.items_list.insert(self.current_drop_row, item_to_be_moved)
-
-            self.reorder_is_active = False
-            self.inner_drag_start_position = QPoint()
-            self.dragged_item = None
-            self.dragged_item_style = None
-            self.dragged_item_row = None
-            self.current_drop_row = None
-            self.dragged_item_key = None
+            rows, drop_row = self.dragged_rows, self.current_drop_row
+            moves = self.block_moves(rows, drop_row)
+            model_moves = self.block_model_moves(rows, drop_row)
+            for item_id in self.shifted_item_ids:
+                self.stop_offset_animation(item_id)
+            self.store.resetOffsets(self.shifted_item_ids)
+            self.shifted_item_ids.clear()
+            if len(rows) == 1:
+                self.store.move(rows[0], 1, drop_row)
+                self.moveRowLayout(rows[0], drop_row)
+            else:
+                order = self.block_order(rows, drop_row)
+                self.store.permute(order)
+                if self.usesPitchTree():
+                    pitches = self.row_pitches.values
+                    self.row_pitches.build(pitches[row] for row in order)
+            self.selection_anchor_row = drop_row + rows.index(self.dragged_item_row)
+            self.reset_drag_state()
             self.update()
+            for from_row, to_row in moves:
+                self.rowMoved.emit(from_row, to_row)
+            for source_row, count, destination_row in model_moves:
+                self.rowsMoved.emit(source_row, count, destination_row)
+            self.flushPendingMutations()
 
-        self.reorder_animation.finished.connect(finished)
-        self.reorder_animation.start(QAbstractAnimation.DeletionPolicy.DeleteWhenStopped)
+        self.clock.animate("reorder", 0, 1, 400, QEasingCurve.Type.InOutSine, update_value, finished)
+
+    def reset_drag_state(self) -> None:
+        self.inner_drag_is_active = False
+        self.reorder_is_active = False
+        self.inner_drag_start_position = QPoint()
+        self.dragged_item = None
+        self.dragged_item_style = None
+        self.dragged_item_row = None
+        self.current_drop_row = None
+        self.dragged_item_key = None
+        self.dragged_rows = list()
+        self.dragged_row_set = set()
+        self.dragged_pitch_prefix = [0]
+        self.drag_snapshots.clear()
+
+    def render_row(self, rect: QRect, item_style, item: Item, device_pixel_ratio: float) -> QPixmap:
+        pixmap = QPixmap(rect.size() * device_pixel_ratio)
+        pixmap.setDevicePixelRatio(device_pixel_ratio)
+        pixmap.fill(Qt.transparent)
+        painter = QPainter(pixmap)
+        self.delegate.paint(painter, QRect(QPoint(0, 0), rect.size()), item_style, item, *self.quality_args("paint"))
+        painter.end()
+        return pixmap
+
+    def render_drag_snapshot(self, rect: QRect, item_style, item: Item) -> QPixmap:
+        margin = self.dragShadowRadius()
+        device_pixel_ratio = self.devicePixelRatioF()
+        size = rect.size().grownBy(QMargins(margin, margin, margin, margin))
+        pixmap = QPixmap(size * device_pixel_ratio)
+        pixmap.setDevicePixelRatio(device_pixel_ratio)
+        pixmap.fill(Qt.transparent)
+        painter = QPainter(pixmap)
+        if margin > 0:
+            painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+            painter.setPen(Qt.NoPen)
+            painter.setBrush(QColor(0, 0, 0, max(1, 80 // margin)))
+            body = QRectF(margin, margin + margin / 4, rect.width(), rect.height())
+            for step in range(margin, 0, -1):
+                painter.drawRoundedRect(body.adjusted(-step, -step, step, step), step, step)
+        self.delegate.paint(painter, QRect(QPoint(margin, margin), rect.size()), item_style, item)
+        painter.end()
+        return pixmap
+
+    def paint_row(self, painter: QPainter, rect: QRect, item_style, item: Item, item_id: Hashable) -> None:
+        if self.frame_stats is None:
+            self.paint_row_content(painter, rect, item_style, item, item_id)
+            return
+        start = time.perf_counter()
+        self.paint_row_content(painter, rect, item_style, item, item_id)
+        self.frame_delegate_time += time.perf_counter() - start
+
+    def paint_row_content(self, painter: QPainter, rect: QRect, item_style, item: Item, item_id: Hashable) -> None:
+        quality = self.render_quality
+        if self.render_cache is None:
+            self.delegate.paint(painter, rect, item_style, item, *self.quality_args("paint"))
+            return
+        device_pixel_ratio = self.devicePixelRatioF()
+        render_async = self.async_renderer is not None
+        # asynchronous renders hold only the delegate content, the decoration is painted on top here
+        key = (item_id, rect.width(), rect.height(), self.delegate.renderState(item_style, item), device_pixel_ratio,
+               render_async, quality)
+        pixmap = self.render_cache.pixmap(key)
+        if pixmap is None and quality == RenderQuality.Reduced:
+            # under pressure a full quality render that is already cached is just as cheap to draw
+            pixmap = self.render_cache.pixmap(key[:-1] + (RenderQuality.Full,))
+        if pixmap is None and render_async:
+            self.async_renderer.request(key, item_id, rect.size(), item_style, item, device_pixel_ratio,
+                                        *self.quality_args("paintContent"))
+            self.delegate.paintPlaceholder(painter, rect, item_style, item)
+        else:
+            if pixmap is None:
+                pixmap = self.render_row(rect, item_style, item, device_pixel_ratio)
+                self.render_cache.insert(item_id, key, pixmap)
+            painter.drawPixmap(rect.topLeft(), pixmap)
+        if render_async:
+            self.delegate.paintDecoration(painter, rect, item_style, item, *self.quality_args("paintDecoration"))
+
+    def dragged_block_cell_position(self, index: int) -> QPointF:
+        # cells of a dragged grid block keep their layout relative to the slot the block was picked up from,
+        # and each travels to its own destination cell while dropping
+        base_position = self.cellPosition(self.drag_base_slot)
+        relative = self.cellPosition(self.drag_base_slot + index) - base_position
+        if not self.reorder_is_active:
+            return self.dragged_point + relative
+        start = self.drag_release_point + relative
+        end = self.cellPosition(self.current_drop_row + index) - QPointF(0, self.scroll_bar.value())
+        return start + (end - start) * self.drop_progress
+
+    def dragged_block_rect(self, index: int, row: int) -> QRect:
+        if self.flow() == Flow.Grid:
+            return QRect(self.dragged_block_cell_position(index).toPoint(), self.cellSize())
+        position = self.dragged_pos + self.dragged_pitch_prefix[index]
+        dragged_extent = self.uniformExtent(row)
+        if self.flow() == Flow.TopToBottom:
+            return QRect(self.spacing(), position, self.rowWidth(), dragged_extent - self.spacing())
+        return QRect(position, self.spacing(), dragged_extent, self.rowHeight() - self.spacing())
+
+    def dragged_block_bounds(self) -> QRect:
+        # everything the dragged block covers on screen, drop shadow included
+        bounds = QRect()
+        for index, row in enumerate(self.dragged_rows):
+            bounds = bounds.united(self.dragged_block_rect(index, row))
+        if bounds.isNull():
+            return bounds
+        margin = self.dragShadowRadius()
+        return bounds.adjusted(-margin, -margin, margin, margin)
+
+    def row_rect(self, row: int) -> QRect:
+        return self.shiftedIndexRect(row, self.store.offset(row))
+
+    def dragged_snapshot(self, row: int, rect: QRect) -> QPixmap:
+        snapshot = self.drag_snapshots.get(row)
+        if snapshot is None:
+            item_style = self.store.itemStyle(row)
+            item_style.selected = True
+            snapshot = self.render_drag_snapshot(rect, item_style, self.store.item(row))
+            self.drag_snapshots[row] = snapshot
+        return snapshot
 
     def paintEvent(self, event: QPaintEvent) -> None:
+        paint_start = time.perf_counter()
+        self.frame_delegate_time = 0
+        rows_painted = 0
         painter = QPainter(self)
         painter.setPen(Qt.NoPen)
+        viewport = event.rect()
 
-        painter.save()
-        i = 0
-        for i in range(len(self.items_by_id)):
-            item = self.items_list[i].item
-            item_style = self.items_list[i].item_style
-            _rect = self.getIndexRect(i)
-            if self.dragged_item_row == i:
-                i += 1
+        first, last = self.visibleRowRange()
+        for i in range(first, last):
+            if i in self.dragged_row_set:
                 continue
-            painter.save()
-            if self.flow() == Flow.TopToBottom:
-                painter.translate(QPoint(0, item_style.offset))
-            else:
-                painter.translate(QPoint(item_style.offset, 0))
-            self.delegate.paint(painter, _rect, item_style, item)
-            painter.restore()
-            i += 1
-        painter.restore()
+            item_style = self.store.itemStyle(i)
+            _rect = self.shiftedIndexRect(i, item_style.offset)
+            if not _rect.intersects(viewport):
+                continue
+            item_id = self.store.itemId(i)
+            item_style.selected = item_id in self.selected_ids
+            self.paint_row(painter, _rect, item_style, self.store.item(i), item_id)
+            rows_painted += 1
 
         if self.inner_drag_is_active or self.reorder_is_active:
-            if self.flow() == Flow.TopToBottom:
-                _rect = QRect(self.spacing(), self.dragged_pos,
-                              self.rowWidth(), self.rowHeight() - self.spacing())
-            else:
-                _rect = QRect(self.dragged_pos, self.spacing(),
-                              self.rowWidth(), self.rowHeight() - self.spacing())
-            self.delegate.paint(painter, _rect, self.dragged_item_style, self.dragged_item)
+            margin = self.dragShadowRadius()
+            for j, row in enumerate(self.dragged_rows):
+                _rect = self.dragged_block_rect(j, row)
+                if not _rect.adjusted(-margin, -margin, margin, margin).intersects(viewport):
+                    continue
+                snapshot = self.dragged_snapshot(row, _rect)
+                painter.drawPixmap(_rect.topLeft() - QPoint(margin, margin), snapshot)
+                rows_painted += 1
+
+        if self.external_drag_source is not None:
+            # rows dragged in from another view are drawn from that view's snapshots
+            source = self.external_drag_source
+            origin = self.external_origin()
+            margin = source.dragShadowRadius()
+            for j, row in enumerate(source.dragged_rows):
+                _rect = source.dragged_block_rect(j, row)
+                if not _rect.translated(origin).adjusted(-margin, -margin, margin, margin).intersects(viewport):
+                    continue
+                snapshot = source.dragged_snapshot(row, _rect)
+                painter.drawPixmap(_rect.topLeft() + origin - QPoint(margin, margin), snapshot)
+                rows_painted += 1
 
         painter.end()
+
+        if self._adaptive_quality:
+            self.update_render_quality((time.perf_counter() - paint_start) * 1000)
+
+        if self.frame_stats is not None:
+            frame_time = time.perf_counter()
+            input_latency_ms = None
+            if self.pending_input_time is not None:
+                input_latency_ms = (frame_time - self.pending_input_time) * 1000
+                self.pending_input_time = None
+            self.frame_stats.recordFrame(frame_time, (frame_time - paint_start) * 1000, self.frame_delegate_time * 1000,
+                                         rows_painted, self.rowCount(), self.clock.activeCount(),
+                                         self.clock.timer.isActive() or self.dragIsActive(), input_latency_ms)
+            self.frameStatsUpdated.emit(self.frame_stats)
@@ -0,0 +1,65 @@
+from typing import Iterable, List
+
+
+class FenwickTree:
+    def __init__(self, values: Iterable[float] = ()) -> None:
+        self.build(values)
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def build(self, values: Iterable[float]) -> None:
+        self.values: List[float] = list(values)
+        self.tree: List[float] = [0] + self.values
+        size = len(self.tree)
+        for i in range(1, size):
+            parent = i + (i & -i)
+            if parent < size:
+                self.tree[parent] += self.tree[i]
+
+    def value(self, index: int) -> float:
+        return self.values[index]
+
+    def add(self, index: int, delta: float) -> None:
+        self.values[index] += delta
+        i = index + 1
+        size = len(self.tree)
+        while i < size:
+            self.tree[i] += delta
+            i += i & -i
+
+    def set(self, index: int, value: float) -> None:
+        delta = value - self.values[index]
+        if delta:
+            self.add(index, delta)
+
+    def append(self, value: float) -> None:
+        i = len(self.tree)
+        self.values.append(value)
+        self.tree.append(value + self.prefix(i - 1) - self.prefix(i - (i & -i)))
+
+    def prefix(self, index: int) -> float:
+        total = 0
+        i = index
+        while i > 0:
+            total += self.tree[i]
+            i -= i & -i
+        return total
+
+    def total(self) -> float:
+        return self.prefix(len(self.values))
+
+    def lowerBound(self, position: float) -> int:
+        # index of the element whose span [prefix(i), prefix(i + 1)) contains position
+        if position < 0:
+            return -1
+        index = 0
+        remaining = position
+        step = 1 << (len(self.tree).bit_length() - 1)
+        while step:
+            next_index = index + step
+            if next_index < len(self.tree) and self.tree[next_index] <= remaining:
+                index = next_index
+                remaining -= self.tree[next_index]
+            step >>= 1
+        return index
@@ -0,0 +1,202 @@
+import sys
+from array import array
+from bisect import bisect_left, insort
+from typing import List, Dict, Tuple, Iterable, Callable, Hashable, Optional, Set, Sequence
+
+from models import Style, Item
+
+
+class FilteredItemStore:
+    # shows the rows of another store that pass a predicate and a text filter; rows are source row numbers,
+    # so items are never copied and reorders are written back to the source
+    def __init__(self, source) -> None:
+        self.source = source
+        self.predicate: Optional[Callable[[Item], bool]] = None
+        self.filter_text = ""
+        self.filter_by_prefix = True
+        self.visible_rows: List[int] = list(range(len(source)))
+        # lower-cased item texts and a sorted (word, item id) list for prefix lookups, built on first use
+        self.texts: Optional[Dict[Hashable, str]] = None
+        self.word_index: List[Tuple[str, Hashable]] = list()
+
+    def __len__(self) -> int:
+        return len(self.visible_rows)
+
+    def sourceStore(self):
+        return self.source
+
+    def sourceRow(self, row: int) -> int:
+        return self.visible_rows[row]
+
+    def mapFromSource(self, source_row: int) -> int:
+        row = bisect_left(self.visible_rows, source_row)
+        if row < len(self.visible_rows) and self.visible_rows[row] == source_row:
+            return row
+        return -1
+
+    def isFiltered(self) -> bool:
+        return self.predicate is not None or bool(self.filter_text)
+
+    def setPredicate(self, predicate: Optional[Callable[[Item], bool]]) -> None:
+        self.predicate = predicate
+        self.refilter()
+
+    def setFilterText(self, text: str, prefix: bool = True) -> None:
+        self.filter_text = text.lower()
+        self.filter_by_prefix = prefix
+        self.refilter()
+
+    def clearFilter(self) -> None:
+        self.predicate = None
+        self.filter_text = ""
+        self.refilter()
+
+    def index_item(self, item_id: Hashable, item: Item) -> None:
+        text = item.text.lower()
+        self.texts[item_id] = text
+        for word in set(text.split()):
+            insort(self.word_index, (word, item_id))
+
+    def unindex_item(self, item_id: Hashable) -> None:
+        text = self.texts.pop(item_id, "")
+        for word in set(text.split()):
+            position = bisect_left(self.word_index, (word, item_id))
+            del self.word_index[position]
+
+    def ensure_index(self) -> None:
+        if self.texts is not None:
+            return
+        source = self.source
+        self.texts = dict()
+        for row in range(len(source)):
+            item_id = source.itemId(row)
+            text = source.item(row).text.lower()
+            self.texts[item_id] = text
+            self.word_index.extend((word, item_id) for word in set(text.split()))
+        self.word_index.sort()
+
+    def text_matches(self) -> Optional[Set[Hashable]]:
+        if not self.filter_text:
+            return None
+        self.ensure_index()
+        if not self.filter_by_prefix:
+            return {item_id for item_id, text in self.texts.items() if self.filter_text in text}
+        # any word of the item starting with the typed text, found with two binary searches
+        start = bisect_left(self.word_index, (self.filter_text,))
+        end = bisect_left(self.word_index, (self.filter_text + "\uffff",))
+        return {item_id for _, item_id in self.word_index[start:end]}
+
+    def accepts(self, source_row: int) -> bool:
+        if self.filter_text:
+            text = self.texts[self.source.itemId(source_row)]
+            if self.filter_by_prefix:
+                if not any(word.startswith(self.filter_text) for word in text.split()):
+                    return False
+            elif self.filter_text not in text:
+                return False
+        return self.predicate is None or self.predicate(self.source.item(source_row))
+
+    def refilter(self) -> None:
+        source = self.source
+        if not self.isFiltered():
+            self.visible_rows = list(range(len(source)))
+            return
+        text_ids = self.text_matches()
+        visible_rows = list()
+        for row in range(len(source)):
+            if text_ids is not None and source.itemId(row) not in text_ids:
+                continue
+            if self.predicate is not None and not self.predicate(source.item(row)):
+                continue
+            visible_rows.append(row)
+        self.visible_rows = visible_rows
+
+    def item(self, row: int) -> Item:
+        return self.source.item(self.visible_rows[row])
+
+    def setItem(self, row: int, item: Item) -> None:
+        # the row stays visible until the next refilter even if the new item no longer matches
+        source_row = self.visible_rows[row]
+        self.source.setItem(source_row, item)
+        if self.texts is not None:
+            item_id = self.source.itemId(source_row)
+            self.unindex_item(item_id)
+            self.index_item(item_id, item)
+
+    def itemId(self, row: int) -> Hashable:
+        return self.source.itemId(self.visible_rows[row])
+
+    def stableId(self, row: int) -> int:
+        return self.source.stableId(self.visible_rows[row])
+
+    def stableIds(self) -> array:
+        source = self.source
+        return array("q", (source.stableId(row) for row in self.visible_rows))
+
+    def itemStyle(self, row: int) -> Style:
+        return self.source.itemStyle(self.visible_rows[row])
+
+    def offset(self, row: int) -> float:
+        return self.source.offset(self.visible_rows[row])
+
+    def setOffset(self, item_id: Hashable, value: float) -> None:
+        self.source.setOffset(item_id, value)
+
+    def insert(self, row: int, items: Iterable[Item]) -> int:
+        # new items go in front of the source row shown at row, or after the last visible one
+        if row < len(self.visible_rows):
+            source_row = self.visible_rows[row]
+        elif self.visible_rows:
+            source_row = self.visible_rows[-1] + 1
+        else:
+            source_row = len(self.source)
+        count = self.source.insert(source_row, items)
+        for position in range(row, len(self.visible_rows)):
+            self.visible_rows[position] += count
+        if self.texts is not None:
+            for new_row in range(source_row, source_row + count):
+                self.index_item(self.source.itemId(new_row), self.source.item(new_row))
+        accepted = [new_row for new_row in range(source_row, source_row + count) if self.accepts(new_row)]
+        self.visible_rows[row:row] = accepted
+        return len(accepted)
+
+    def remove(self, row: int, count: int) -> List[Hashable]:
+        source_rows = self.visible_rows[row:row + count]
+        removed_ids = list()
+        # visible rows need not be adjacent in the source, so remove them back to front
+        for source_row in reversed(source_rows):
+            removed_ids.extend(self.source.remove(source_row, 1))
+        removed_ids.reverse()
+        if self.texts is not None:
+            for item_id in removed_ids:
+                self.unindex_item(item_id)
+        del self.visible_rows[row:row + count]
+        for position in range(row, len(self.visible_rows)):
+            self.visible_rows[position] -= len(source_rows)
+        return removed_ids
+
+    def move(self, source_row: int, count: int, destination_row: int) -> None:
+        order = list(range(len(self.visible_rows)))
+        block = order[source_row:source_row + count]
+        del order[source_row:source_row + count]
+        order[destination_row:destination_row] = block
+        self.permute(order)
+
+    def permute(self, order: Sequence[int]) -> None:
+        # visible rows keep their source slots and only trade items, hidden rows stay where they are
+        slots = self.visible_rows
+        source_order = list(range(len(self.source)))
+        for slot, row in zip(slots, order):
+            source_order[slot] = slots[row]
+        self.source.permute(source_order)
+
+    def resetOffsets(self, item_ids: Iterable[Hashable]) -> None:
+        self.source.resetOffsets(item_ids)
+
+    def memoryPerRow(self) -> float:
+        if not self.visible_rows:
+            return 0
+        own = sys.getsizeof(self.visible_rows) + sys.getsizeof(self.word_index)
+        if self.texts is not None:
+            own += sys.getsizeof(self.texts)
+        return self.source.memoryPerRow() * len(self.source) / len(self.visible_rows) + own / len(self.visible_rows)
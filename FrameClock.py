@@ -0,0 +1,127 @@
+from typing import Optional, Dict, Callable, Hashable, List
+
+from PySide6.QtCore import QObject, QTimer, QElapsedTimer, QEasingCurve, Signal, Qt
+
+
+class Tween:
+    __slots__ = ("start_value", "end_value", "duration", "elapsed", "easing", "setter", "finished")
+
+    def __init__(self) -> None:
+        self.reset()
+
+    def reset(self) -> None:
+        self.start_value: float = 0
+        self.end_value: float = 0
+        self.duration: int = 0
+        self.elapsed: int = 0
+        self.easing: Optional[QEasingCurve] = None
+        self.setter: Optional[Callable[[float], None]] = None
+        self.finished: Optional[Callable[[], None]] = None
+
+    def value(self) -> float:
+        if self.duration <= 0 or self.elapsed >= self.duration:
+            return self.end_value
+        progress = self.easing.valueForProgress(self.elapsed / self.duration)
+        return self.start_value + (self.end_value - self.start_value) * progress
+
+
+class FrameClock(QObject):
+    frame = Signal()
+
+    def __init__(self, parent: Optional[QObject] = None, interval: int = 16) -> None:
+        super().__init__(parent)
+        self.tweens: Dict[Hashable, Tween] = dict()
+        self.pool: List[Tween] = list()
+        self.drivers: Dict[Hashable, Callable[[int], bool]] = dict()
+        self.easing_curves: Dict[QEasingCurve.Type, QEasingCurve] = dict()
+        self.elapsed_timer = QElapsedTimer()
+        self.timer = QTimer(self)
+        self.timer.setTimerType(Qt.TimerType.PreciseTimer)
+        self.timer.setInterval(interval)
+        self.timer.timeout.connect(self.tick)
+
+    def easingCurve(self, easing_type: QEasingCurve.Type) -> QEasingCurve:
+        if easing_type not in self.easing_curves:
+            self.easing_curves[easing_type] = QEasingCurve(easing_type)
+        return self.easing_curves[easing_type]
+
+    def animate(self, key: Hashable, start_value: float, end_value: float, duration: int,
+                easing_type: QEasingCurve.Type, setter: Callable[[float], None],
+                finished: Optional[Callable[[], None]] = None) -> None:
+        tween = self.tweens.get(key)
+        if tween is None:
+            tween = self.pool.pop() if self.pool else Tween()
+            self.tweens[key] = tween
+        tween.start_value = start_value
+        tween.end_value = end_value
+        tween.duration = duration
+        tween.elapsed = 0
+        tween.easing = self.easingCurve(easing_type)
+        tween.setter = setter
+        tween.finished = finished
+        setter(start_value)
+        self.ensureRunning()
+
+    def drive(self, key: Hashable, callback: Callable[[int], bool]) -> None:
+        # callback receives the milliseconds since the previous frame and returns False once it is done
+        self.drivers[key] = callback
+        self.ensureRunning()
+
+    def isDriving(self, key: Hashable) -> bool:
+        return key in self.drivers
+
+    def stopDriving(self, key: Hashable) -> None:
+        self.drivers.pop(key, None)
+
+    def ensureRunning(self) -> None:
+        if not self.timer.isActive():
+            self.elapsed_timer.start()
+            self.timer.start()
+
+    def isAnimating(self, key: Hashable) -> bool:
+        return key in self.tweens
+
+    def activeCount(self) -> int:
+        return len(self.tweens)
+
+    def stop(self, key: Hashable) -> None:
+        tween = self.tweens.pop(key, None)
+        if tween is not None:
+            self.recycle(tween)
+
+    def stopAll(self) -> None:
+        for tween in self.tweens.values():
+            self.recycle(tween)
+        self.tweens.clear()
+        self.drivers.clear()
+        self.timer.stop()
+
+    def recycle(self, tween: Tween) -> None:
+        tween.reset()
+        self.pool.append(tween)
+
+    def tick(self) -> None:
+        delta = self.elapsed_timer.restart()
+        for key, driver in list(self.drivers.items()):
+            if not driver(delta) and self.drivers.get(key) is driver:
+                del self.drivers[key]
+
+        finished_keys = list()
+        for key, tween in self.tweens.items():
+            tween.elapsed += delta
+            tween.setter(tween.value())
+            if tween.elapsed >= tween.duration:
+                finished_keys.append(key)
+
+        callbacks = list()
+        for key in finished_keys:
+            tween = self.tweens.pop(key)
+            if tween.finished is not None:
+                callbacks.append(tween.finished)
+            self.recycle(tween)
+
+        if not self.tweens and not self.drivers:
+            self.timer.stop()
+        self.frame.emit()
+        for callback in callbacks:
+            callback()
@@ -0,0 +1,44 @@
+from dataclasses import dataclass
+from typing import Optional
+
+
+@dataclass
+class FrameStats:
+    frame_budget_ms: float = 1000 / 60
+    frames: int = 0
+    paint_ms: float = 0
+    max_paint_ms: float = 0
+    total_paint_ms: float = 0
+    delegate_ms: float = 0
+    rows_painted: int = 0
+    total_rows: int = 0
+    active_animations: int = 0
+    frame_interval_ms: float = 0
+    dropped_frames: int = 0
+    input_latency_ms: float = 0
+    max_input_latency_ms: float = 0
+    last_frame_time: Optional[float] = None
+
+    def averagePaintMs(self) -> float:
+        return self.total_paint_ms / self.frames if self.frames else 0
+
+    def recordFrame(self, frame_time: float, paint_ms: float, delegate_ms: float, rows_painted: int,
+                    total_rows: int, active_animations: int, animating: bool,
+                    input_latency_ms: Optional[float]) -> None:
+        self.frames += 1
+        self.paint_ms = paint_ms
+        self.max_paint_ms = max(self.max_paint_ms, paint_ms)
+        self.total_paint_ms += paint_ms
+        self.delegate_ms = delegate_ms
+        self.rows_painted = rows_painted
+        self.total_rows = total_rows
+        self.active_animations = active_animations
+        if self.last_frame_time is not None:
+            self.frame_interval_ms = (frame_time - self.last_frame_time) * 1000
+            # idle gaps between interactions are not dropped frames
+            if animating and self.frame_interval_ms > 1.5 * self.frame_budget_ms:
+                self.dropped_frames += round(self.frame_interval_ms / self.frame_budget_ms) - 1
+        self.last_frame_time = frame_time
+        if input_latency_ms is not None:
+            self.input_latency_ms = input_latency_ms
+            self.max_input_latency_ms = max(self.max_input_latency_ms, input_latency_ms)
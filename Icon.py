@@ -1,8 +1,9 @@
 from typing import Union
 
 import PySide6
-from PySide6.QtCore import QSize
-from PySide6.QtGui import QGuiApplication, QIcon, QPixmap
+from PySide6.QtGui import QIcon, QPixmap
+
+from IconCache import IconCache
 
 
 class Icon(QIcon):
@@ -11,9 +12,8 @@ class Icon(QIcon):
             super(Icon, self).__init__()
             return
         elif isinstance(icon_path, str):
-            if 1 < QGuiApplication.primaryScreen().devicePixelRatio() < 2:
-                icon_path = icon_path.replace(".png", "@2x.png")
-            super(Icon, self).__init__(icon_path)
+            super(Icon, self).__init__()
+            self.addFile(icon_path)
         elif isinstance(icon_path, QPixmap):
             super(Icon, self).__init__(icon_path)
         else:
@@ -21,6 +21,8 @@ class Icon(QIcon):
 
     def addFile(self, fileName: str, size: PySide6.QtCore.QSize = None,
                 mode: PySide6.QtGui.QIcon.Mode = None, state: PySide6.QtGui.QIcon.State = None) -> None:
-        if 1 < QGuiApplication.primaryScreen().devicePixelRatio() < 2:
-            fileName = fileName.replace(".png", "@2x.png")
-        super(Icon, self).addFile(fileName, QSize(), QIcon.Normal, QIcon.Off)
+        # both resolutions come from the shared cache, QIcon picks one per screen when it is painted
+        cache = IconCache.instance()
+        self.addPixmap(cache.pixmap(fileName, 1.0), QIcon.Normal, QIcon.Off)
+        if cache.resolve(fileName, 2.0)[1] > 1:
+            self.addPixmap(cache.pixmap(fileName, 2.0), QIcon.Normal, QIcon.Off)
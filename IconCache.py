@@ -0,0 +1,103 @@
+import os
+from typing import Optional, Dict, Set, Tuple, Iterable
+
+from PySide6.QtCore import QObject, QRunnable, QThreadPool, Signal
+from PySide6.QtGui import QImage, QPixmap
+
+from RenderCache import RenderCache
+
+
+class DecodeJob(QRunnable):
+    def __init__(self, cache: "IconCache", path: str, device_pixel_ratio: float) -> None:
+        super().__init__()
+        self.cache = cache
+        self.path = path
+        self.device_pixel_ratio = device_pixel_ratio
+        self.file_path, self.image_ratio = cache.resolve(path, device_pixel_ratio)
+
+    def run(self) -> None:
+        # QImage is safe to decode off the GUI thread, the QPixmap conversion happens back on it
+        image = QImage(self.file_path)
+        image.setDevicePixelRatio(self.image_ratio)
+        self.cache.decoded.emit(self.path, self.device_pixel_ratio, image)
+
+
+class IconCache(QObject):
+    imageReady = Signal(str)
+    decoded = Signal(str, float, QImage)
+
+    shared_instance: Optional["IconCache"] = None
+
+    def __init__(self, budget: int = 32 * 1024 * 1024, thread_pool: Optional[QThreadPool] = None,
+                 parent: Optional[QObject] = None) -> None:
+        super().__init__(parent)
+        self.pixmaps = RenderCache(budget)
+        self.thread_pool = thread_pool or QThreadPool.globalInstance()
+        self.pending: Set[Tuple[str, float]] = set()
+        self.variants: Dict[Tuple[str, float], Tuple[str, float]] = dict()
+        self.decoded.connect(self.image_decoded)
+
+    @classmethod
+    def instance(cls) -> "IconCache":
+        if cls.shared_instance is None:
+            cls.shared_instance = cls()
+        return cls.shared_instance
+
+    def budget(self) -> int:
+        return self.pixmaps.budget()
+
+    def setBudget(self, budget: int) -> None:
+        self.pixmaps.setBudget(budget)
+
+    def resolve(self, path: str, device_pixel_ratio: float) -> Tuple[str, float]:
+        # file to load for a screen and the pixel ratio it was drawn for; high-dpi screens prefer an @2x variant
+        key = (path, device_pixel_ratio)
+        variant = self.variants.get(key)
+        if variant is None:
+            variant = (path, 1.0)
+            if device_pixel_ratio > 1:
+                root, extension = os.path.splitext(path)
+                high_dpi_path = f"{root}@2x{extension}"
+                if os.path.exists(high_dpi_path):
+                    variant = (high_dpi_path, 2.0)
+            self.variants[key] = variant
+        return variant
+
+    def cachedPixmap(self, path: str, device_pixel_ratio: float) -> Optional[QPixmap]:
+        return self.pixmaps.pixmap((path, device_pixel_ratio))
+
+    def pixmap(self, path: str, device_pixel_ratio: float) -> QPixmap:
+        key = (path, device_pixel_ratio)
+        pixmap = self.pixmaps.pixmap(key)
+        if pixmap is None:
+            file_path, image_ratio = self.resolve(path, device_pixel_ratio)
+            pixmap = QPixmap(file_path)
+            pixmap.setDevicePixelRatio(image_ratio)
+            self.pixmaps.insert(path, key, pixmap)
+        return pixmap
+
+    def prefetch(self, paths: Iterable[str], device_pixel_ratio: float) -> None:
+        for path in paths:
+            key = (path, device_pixel_ratio)
+            if not path or key in self.pending or self.pixmaps.pixmap(key) is not None:
+                continue
+            self.pending.add(key)
+            self.thread_pool.start(DecodeJob(self, path, device_pixel_ratio))
+
+    def image_decoded(self, path: str, device_pixel_ratio: float, image: QImage) -> None:
+        self.pending.discard((path, device_pixel_ratio))
+        if image.isNull():
+            return
+        pixmap = QPixmap.fromImage(image)
+        pixmap.setDevicePixelRatio(image.devicePixelRatio())
+        self.pixmaps.insert(path, (path, device_pixel_ratio), pixmap)
+        self.imageReady.emit(path)
+
+    def invalidate(self, path: str) -> None:
+        self.pixmaps.invalidate(path)
+        for key in [key for key in self.variants if key[0] == path]:
+            del self.variants[key]
+
+    def clear(self) -> None:
+        self.pixmaps.clear()
+        self.variants.clear()
@@ -0,0 +1,186 @@
+import sys
+import uuid
+from array import array
+from typing import List, Dict, Iterable, Hashable, Sequence
+
+from models import Style, Item, Index
+
+
+class ItemStore:
+    def __init__(self) -> None:
+        self.items_by_id: Dict[uuid.UUID, Index] = dict()
+        self.items_list: List[Index] = list()
+        # serials number items in insertion order and, unlike the uuids, survive a save and reload
+        self.next_serial = 0
+
+    def __len__(self) -> int:
+        return len(self.items_list)
+
+    def item(self, row: int) -> Item:
+        return self.items_list[row].item
+
+    def setItem(self, row: int, item: Item) -> None:
+        self.items_list[row].item = item
+
+    def itemId(self, row: int) -> Hashable:
+        return self.items_list[row].item_id
+
+    def stableId(self, row: int) -> int:
+        return self.items_list[row].serial
+
+    def stableIds(self) -> array:
+        return array("q", (index.serial for index in self.items_list))
+
+    def itemStyle(self, row: int) -> Style:
+        return self.items_list[row].item_style
+
+    def offset(self, row: int) -> float:
+        return self.items_list[row].item_style.offset
+
+    def setOffset(self, item_id: Hashable, value: float) -> None:
+        self.items_by_id[item_id].item_style.offset = value
+
+    def insert(self, row: int, items: Iterable[Item]) -> int:
+        indexes = [Index(item, Style(offset=0), uuid.uuid4(), serial)
+                   for serial, item in enumerate(items, self.next_serial)]
+        self.next_serial += len(indexes)
+        self.items_list[row:row] = indexes
+        self.items_by_id.update((index.item_id, index) for index in indexes)
+        return len(indexes)
+
+    def insertIndexes(self, row: int, indexes: List[Index]) -> int:
+        # adopts records taken from another store, keeping their ids and styles; serials are local to a store
+        for serial, index in enumerate(indexes, self.next_serial):
+            index.serial = serial
+        self.next_serial += len(indexes)
+        self.items_list[row:row] = indexes
+        self.items_by_id.update((index.item_id, index) for index in indexes)
+        return len(indexes)
+
+    def takeIndexes(self, row: int, count: int) -> List[Index]:
+        indexes = self.items_list[row:row + count]
+        for index in indexes:
+            del self.items_by_id[index.item_id]
+        del self.items_list[row:row + count]
+        return indexes
+
+    def remove(self, row: int, count: int) -> List[Hashable]:
+        removed_ids = [index.item_id for index in self.items_list[row:row + count]]
+        for item_id in removed_ids:
+            del self.items_by_id[item_id]
+        del self.items_list[row:row + count]
+        return removed_ids
+
+    def move(self, source_row: int, count: int, destination_row: int) -> None:
+        # destination_row is the row the first moved item ends up at
+        block = self.items_list[source_row:source_row + count]
+        del self.items_list[source_row:source_row + count]
+        self.items_list[destination_row:destination_row] = block
+
+    def permute(self, order: Sequence[int]) -> None:
+        # order[new_row] is the row the item previously occupied
+        self.items_list = [self.items_list[row] for row in order]
+
+    def resetOffsets(self, item_ids: Iterable[Hashable]) -> None:
+        for item_id in item_ids:
+            index = self.items_by_id.get(item_id)
+            if index is not None:
+                index.item_style.offset = 0
+
+    def memoryPerRow(self) -> float:
+        # storage overhead in bytes, not counting the Item objects themselves
+        if not self.items_list:
+            return 0
+        index = self.items_list[0]
+        record = (sys.getsizeof(index) + sys.getsizeof(vars(index))
+                  + sys.getsizeof(index.item_style) + sys.getsizeof(vars(index.item_style))
+                  + sys.getsizeof(index.item_id))
+        containers = sys.getsizeof(self.items_list) + sys.getsizeof(self.items_by_id)
+        return record + containers / len(self.items_list)
+
+
+class CompactItemStore:
+    def __init__(self) -> None:
+        self.items: List[Item] = list()
+        self.offsets = array("d")
+        self.order = array("q")
+        self.free_ids: List[int] = list()
+        # slots are reused after removals, so each slot also records the serial of the item it holds
+        self.serials = array("q")
+        self.next_serial = 0
+
+    def __len__(self) -> int:
+        return len(self.order)
+
+    def item(self, row: int) -> Item:
+        return self.items[self.order[row]]
+
+    def setItem(self, row: int, item: Item) -> None:
+        self.items[self.order[row]] = item
+
+    def itemId(self, row: int) -> int:
+        return self.order[row]
+
+    def stableId(self, row: int) -> int:
+        return self.serials[self.order[row]]
+
+    def stableIds(self) -> array:
+        serials = self.serials
+        return array("q", (serials[item_id] for item_id in self.order))
+
+    def itemStyle(self, row: int) -> Style:
+        return Style(offset=self.offsets[self.order[row]])
+
+    def offset(self, row: int) -> float:
+        return self.offsets[self.order[row]]
+
+    def setOffset(self, item_id: int, value: float) -> None:
+        self.offsets[item_id] = value
+
+    def allocate(self, item: Item) -> int:
+        serial = self.next_serial
+        self.next_serial += 1
+        if self.free_ids:
+            item_id = self.free_ids.pop()
+            self.items[item_id] = item
+            self.offsets[item_id] = 0
+            self.serials[item_id] = serial
+            return item_id
+        self.items.append(item)
+        self.offsets.append(0)
+        self.serials.append(serial)
+        return len(self.items) - 1
+
+    def insert(self, row: int, items: Iterable[Item]) -> int:
+        item_ids = array("q", (self.allocate(item) for item in items))
+        self.order[row:row] = item_ids
+        return len(item_ids)
+
+    def remove(self, row: int, count: int) -> List[int]:
+        removed_ids = self.order[row:row + count].tolist()
+        for item_id in removed_ids:
+            self.items[item_id] = None
+        self.free_ids.extend(removed_ids)
+        del self.order[row:row + count]
+        return removed_ids
+
+    def move(self, source_row: int, count: int, destination_row: int) -> None:
+        block = self.order[source_row:source_row + count]
+        del self.order[source_row:source_row + count]
+        self.order[destination_row:destination_row] = block
+
+    def permute(self, order: Sequence[int]) -> None:
+        previous_order = self.order
+        self.order = array("q", [previous_order[row] for row in order])
+
+    def resetOffsets(self, item_ids: Iterable[int]) -> None:
+        offsets = self.offsets
+        for item_id in item_ids:
+            offsets[item_id] = 0
+
+    def memoryPerRow(self) -> float:
+        if not self.order:
+            return 0
+        total = (sys.getsizeof(self.items) + sys.getsizeof(self.offsets) + sys.getsizeof(self.order)
+                 + sys.getsizeof(self.serials) + sys.getsizeof(self.free_ids))
+        return total / len(self.order)
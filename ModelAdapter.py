@@ -0,0 +1,131 @@
+from PySide6.QtCore import QObject, QAbstractItemModel, QModelIndex, QTimer, Qt
+from PySide6.QtGui import QColor, QBrush
+from PySide6.QtWidgets import QWidget
+
+from models import Item
+
+
+class ModelAdapter(QObject):
+    def __init__(self, view: QWidget, model: QAbstractItemModel, fetch_threshold: int = 20) -> None:
+        super().__init__(view)
+        self.view = view
+        self.model = model
+        self.fetch_threshold = fetch_threshold
+        self.is_syncing = False
+        self.is_fetching = False
+        self.reset_is_scheduled = False
+        self.reset_is_queued = False
+
+        self.model.rowsInserted.connect(self.rows_inserted)
+        self.model.rowsRemoved.connect(self.rows_removed)
+        self.model.rowsMoved.connect(self.rows_moved)
+        self.model.dataChanged.connect(self.data_changed)
+        self.model.modelReset.connect(self.model_reset)
+        self.model.layoutChanged.connect(self.model_reset)
+        self.view.rowsMoved.connect(self.view_rows_moved)
+        self.view.scroll_bar.valueChanged.connect(self.fetch_if_needed)
+        self.model_reset()
+
+    def detach(self) -> None:
+        self.model.rowsInserted.disconnect(self.rows_inserted)
+        self.model.rowsRemoved.disconnect(self.rows_removed)
+        self.model.rowsMoved.disconnect(self.rows_moved)
+        self.model.dataChanged.disconnect(self.data_changed)
+        self.model.modelReset.disconnect(self.model_reset)
+        self.model.layoutChanged.disconnect(self.model_reset)
+        self.view.rowsMoved.disconnect(self.view_rows_moved)
+        self.view.scroll_bar.valueChanged.disconnect(self.fetch_if_needed)
+
+    def itemForRow(self, row: int) -> Item:
+        index = self.model.index(row, 0)
+        color = index.data(Qt.ItemDataRole.BackgroundRole)
+        if color is None:
+            color = index.data(Qt.ItemDataRole.DecorationRole)
+        if isinstance(color, QBrush):
+            color = color.color()
+        text = index.data(Qt.ItemDataRole.DisplayRole)
+        return Item(QColor(color) if color is not None else QColor(), text=str(text) if text is not None else "")
+
+    def item_for_source_row(self, source_row: int) -> Item:
+        # the virtual store numbers items by their model row at the last reset; rows inserted, removed or moved
+        # since then are followed through the store's current order
+        return self.itemForRow(self.view.itemStore().mapFromSource(source_row))
+
+    def reset_after_drag(self) -> bool:
+        # during a drag the view's rows are about to be rearranged by the drop, so model row numbers cannot be
+        # replayed into it; the view reloads from the model once the drop has landed instead
+        if not self.view.dragIsActive():
+            return False
+        if not self.reset_is_queued:
+            self.reset_is_scheduled = True
+            self.reset_is_queued = True
+            self.view.pending_mutations.append(self.model_reset)
+        return True
+
+    def rows_inserted(self, parent: QModelIndex, first: int, last: int) -> None:
+        if parent.isValid() or self.is_syncing or self.reset_after_drag():
+            return
+        self.view.insertRows(first, [self.itemForRow(row) for row in range(first, last + 1)])
+        self.fetch_if_needed()
+
+    def rows_removed(self, parent: QModelIndex, first: int, last: int) -> None:
+        if parent.isValid() or self.is_syncing or self.reset_after_drag():
+            return
+        self.view.removeRows(first, last - first + 1)
+        self.fetch_if_needed()
+
+    def rows_moved(self, parent: QModelIndex, start: int, end: int,
+                   destination: QModelIndex, row: int) -> None:
+        if parent.isValid() or destination.isValid() or self.is_syncing or self.reset_after_drag():
+            return
+        self.view.moveRows(start, end - start + 1, row)
+
+    def data_changed(self, top_left: QModelIndex, bottom_right: QModelIndex, roles=()) -> None:
+        if top_left.parent().isValid() or top_left.column() > 0 or self.reset_after_drag():
+            return
+        for row in range(top_left.row(), bottom_right.row() + 1):
+            self.view.setItem(row, self.itemForRow(row))
+
+    def model_reset(self) -> None:
+        if self.is_syncing or self.reset_after_drag():
+            return
+        self.reset_is_scheduled = False
+        self.reset_is_queued = False
+        # items are read from the model only as rows are shown, however many rows it has
+        row_count = self.model.rowCount()
+        if not row_count:
+            self.view.removeRows(0, self.view.rowCount())
+        self.view.setVirtualItems(row_count, self.item_for_source_row)
+        self.fetch_if_needed()
+
+    def view_rows_moved(self, source_row: int, count: int, destination_row: int) -> None:
+        if self.reset_is_scheduled:
+            # the model changed under the drag, the coming reset shows the model's order
+            return
+        # the view already shows the new order, so ignore the model's own notifications for this move
+        self.is_syncing = True
+        try:
+            moved = self.model.moveRows(QModelIndex(), source_row, count, QModelIndex(), destination_row)
+        finally:
+            self.is_syncing = False
+        # scattered rows arrive as several moves; once one fails the rest are skipped and the view reloads instead
+        if not moved and not self.reset_is_scheduled:
+            self.reset_is_scheduled = True
+            QTimer.singleShot(0, self.model_reset)
+
+    def needs_more_rows(self) -> bool:
+        _, last = self.view.visibleRowRange()
+        return last + self.fetch_threshold >= self.view.rowCount()
+
+    def fetch_if_needed(self, *args) -> None:
+        if self.is_fetching:
+            return
+        self.is_fetching = True
+        try:
+            while self.model.canFetchMore(QModelIndex()) and self.needs_more_rows():
+                row_count = self.view.rowCount()
+                self.model.fetchMore(QModelIndex())
+                if self.view.rowCount() == row_count:
+                    break
+        finally:
+            self.is_fetching = False
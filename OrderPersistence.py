@@ -0,0 +1,116 @@
+import mmap
+import os
+import struct
+import sys
+from array import array
+from typing import Optional, Sequence, Iterator, Tuple
+
+from PySide6.QtCore import QObject
+
+MAGIC = b"DLVO"
+VERSION = 1
+HEADER = struct.Struct("<4sIQ")
+MOVE = struct.Struct("<qq")
+
+
+def writeOrder(path: str, ids: Sequence[int]) -> None:
+    # a small header followed by the stable ids as little-endian int64, written next to the target and swapped in
+    data = array("q", ids)
+    if sys.byteorder != "little":
+        data.byteswap()
+    temporary_path = path + ".tmp"
+    with open(temporary_path, "wb") as output:
+        output.write(HEADER.pack(MAGIC, VERSION, len(data)))
+        data.tofile(output)
+    os.replace(temporary_path, path)
+
+
+def readOrder(path: str) -> array:
+    ids = array("q")
+    with open(path, "rb") as input_file:
+        if os.fstat(input_file.fileno()).st_size < HEADER.size:
+            raise ValueError(f"{path} is not an order file")
+        with mmap.mmap(input_file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            magic, version, count = HEADER.unpack_from(mapped)
+            if magic != MAGIC or version != VERSION:
+                raise ValueError(f"{path} is not an order file")
+            end = HEADER.size + count * ids.itemsize
+            if end > len(mapped):
+                raise ValueError(f"{path} is truncated")
+            with memoryview(mapped) as view:
+                ids.frombytes(view[HEADER.size:end])
+    if sys.byteorder != "little":
+        ids.byteswap()
+    return ids
+
+
+def readMoves(path: str) -> Iterator[Tuple[int, int]]:
+    if not os.path.exists(path):
+        return
+    with open(path, "rb") as input_file:
+        data = input_file.read()
+    # a crash can leave half a record at the end, which is ignored
+    usable = len(data) - len(data) % MOVE.size
+    yield from MOVE.iter_unpack(data[:usable])
+
+
+class OrderLog(QObject):
+    # keeps a view's order on disk as a full snapshot plus an append-only log of the moves made since
+    def __init__(self, view, path: str, log_path: Optional[str] = None) -> None:
+        super().__init__(view)
+        self.view = view
+        self.path = path
+        self.log_path = log_path or path + ".log"
+        self.log_file = None
+        # nothing is written until the saved order has been restored or the caller has finished loading items,
+        # otherwise loading the items would overwrite the saved order before it could be read
+        self.is_loaded = False
+        self.view.rowMoved.connect(self.row_moved)
+        self.view.orderChanged.connect(self.save)
+        self.view.rowsRearranged.connect(self.save)
+
+    def detach(self) -> None:
+        self.view.rowMoved.disconnect(self.row_moved)
+        self.view.orderChanged.disconnect(self.save)
+        self.view.rowsRearranged.disconnect(self.save)
+        self.close_log()
+
+    def close_log(self) -> None:
+        if self.log_file is not None:
+            self.log_file.close()
+            self.log_file = None
+
+    def finishLoading(self) -> None:
+        self.is_loaded = True
+        self.save()
+
+    def save(self, *args) -> None:
+        if not self.is_loaded:
+            return
+        # rows were inserted, removed, moved by code or reordered wholesale: only drops inside the view are logged as
+        # moves, anything else writes a fresh snapshot and starts an empty log
+        self.close_log()
+        writeOrder(self.path, self.view.orderIds())
+        open(self.log_path, "wb").close()
+
+    def row_moved(self, from_row: int, to_row: int) -> None:
+        if not self.is_loaded:
+            return
+        if self.view.isFiltered():
+            # a drop in a filtered view moves rows of the whole list that the visible row numbers do not describe
+            self.save()
+            return
+        if self.log_file is None:
+            self.log_file = open(self.log_path, "ab")
+        self.log_file.write(MOVE.pack(from_row, to_row))
+        self.log_file.flush()
+
+    def restore(self) -> None:
+        self.close_log()
+        self.is_loaded = False
+        ids = readOrder(self.path).tolist() if os.path.exists(self.path) else self.view.orderIds().tolist()
+        # the logged moves are replayed on the ids, so the view is reordered once
+        for from_row, to_row in readMoves(self.log_path):
+            ids.insert(to_row, ids.pop(from_row))
+        self.view.setOrderIds(ids)
+        self.finishLoading()
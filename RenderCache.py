@@ -0,0 +1,65 @@
+from collections import OrderedDict
+from typing import Optional, Dict, Set, Hashable
+
+from PySide6.QtGui import QPixmap
+
+
+class RenderCache:
+    def __init__(self, budget: int = 64 * 1024 * 1024) -> None:
+        self._budget = budget
+        self.used_bytes = 0
+        self.pixmaps: "OrderedDict[Hashable, QPixmap]" = OrderedDict()
+        self.keys_by_item: Dict[Hashable, Set[Hashable]] = dict()
+        self.item_by_key: Dict[Hashable, Hashable] = dict()
+
+    def budget(self) -> int:
+        return self._budget
+
+    def setBudget(self, budget: int) -> None:
+        self._budget = budget
+        self.evict()
+
+    @staticmethod
+    def cost(pixmap: QPixmap) -> int:
+        return pixmap.width() * pixmap.height() * pixmap.depth() // 8
+
+    def pixmap(self, key: Hashable) -> Optional[QPixmap]:
+        pixmap = self.pixmaps.get(key)
+        if pixmap is not None:
+            self.pixmaps.move_to_end(key)
+        return pixmap
+
+    def insert(self, item_id: Hashable, key: Hashable, pixmap: QPixmap) -> None:
+        if key in self.pixmaps:
+            self.remove(key)
+        cost = self.cost(pixmap)
+        if cost > self._budget:
+            return
+        self.pixmaps[key] = pixmap
+        self.keys_by_item.setdefault(item_id, set()).add(key)
+        self.item_by_key[key] = item_id
+        self.used_bytes += cost
+        self.evict()
+
+    def remove(self, key: Hashable) -> None:
+        pixmap = self.pixmaps.pop(key)
+        self.used_bytes -= self.cost(pixmap)
+        item_id = self.item_by_key.pop(key)
+        keys = self.keys_by_item[item_id]
+        keys.discard(key)
+        if not keys:
+            del self.keys_by_item[item_id]
+
+    def evict(self) -> None:
+        while self.used_bytes > self._budget and self.pixmaps:
+            self.remove(next(iter(self.pixmaps)))
+
+    def invalidate(self, item_id: Hashable) -> None:
+        for key in list(self.keys_by_item.get(item_id, ())):
+            self.remove(key)
+
+    def clear(self) -> None:
+        self.pixmaps.clear()
+        self.keys_by_item.clear()
+        self.item_by_key.clear()
+        self.used_bytes = 0
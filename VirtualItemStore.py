@@ -0,0 +1,163 @@
+import sys
+from array import array
+from collections import OrderedDict, deque
+from typing import List, Dict, Iterable, Iterator, Callable, Optional, Sequence
+
+from models import Style, Item
+
+
+class IteratorSource:
+    # random access over a forward-only iterator; the last window items read stay available, so scrolling back
+    # a little does not restart it, and only a jump further back than that replays the iterator from the start
+    def __init__(self, make_iterator: Callable[[], Iterator[Item]], window: int = 512) -> None:
+        self.make_iterator = make_iterator
+        self.iterator: Optional[Iterator[Item]] = None
+        self.position = 0
+        self.behind: "deque[Item]" = deque(maxlen=max(1, window))
+
+    def __call__(self, source_row: int) -> Item:
+        first_behind = self.position - len(self.behind)
+        if self.iterator is not None and first_behind <= source_row < self.position:
+            return self.behind[source_row - first_behind]
+        if self.iterator is None or source_row < self.position:
+            self.iterator = iter(self.make_iterator())
+            self.position = 0
+            self.behind.clear()
+        while self.position <= source_row:
+            self.behind.append(next(self.iterator))
+            self.position += 1
+        return self.behind[-1]
+
+
+class VirtualItemStore:
+    def __init__(self, row_count: int, item_for_row: Callable[[int], Item], capacity: int = 512) -> None:
+        self.source_count = row_count
+        self.item_for_row = item_for_row
+        self.capacity = capacity
+        self.cache: "OrderedDict[int, Item]" = OrderedDict()
+        # items that cannot be fetched again from the source: inserted rows and replaced ones
+        self.pinned: Dict[int, Item] = dict()
+        self.offsets: Dict[int, float] = dict()
+        # order[row] is the source row shown at row, None while the source order is untouched
+        self.order: Optional[array] = None
+        # the inverse of order, built on first use after the order changed
+        self.rows_by_source: Optional[array] = None
+        self.next_id = row_count
+
+    @classmethod
+    def fromIterable(cls, make_iterator: Callable[[], Iterable[Item]], row_count: int,
+                     capacity: int = 512) -> "VirtualItemStore":
+        return cls(row_count, IteratorSource(make_iterator, capacity), capacity)
+
+    def __len__(self) -> int:
+        if self.order is None:
+            return self.source_count
+        return len(self.order)
+
+    def materialize_order(self) -> array:
+        if self.order is None:
+            self.order = array("q", range(self.source_count))
+        return self.order
+
+    def sourceRow(self, row: int) -> int:
+        if self.order is None:
+            return row
+        return self.order[row]
+
+    def mapFromSource(self, source_row: int) -> int:
+        if self.order is None:
+            return source_row if 0 <= source_row < self.source_count else -1
+        if self.rows_by_source is None:
+            self.rows_by_source = array("q", [-1]) * self.next_id
+            for row, item_id in enumerate(self.order):
+                self.rows_by_source[item_id] = row
+        if not 0 <= source_row < len(self.rows_by_source):
+            return -1
+        return self.rows_by_source[source_row]
+
+    def item(self, row: int) -> Item:
+        item_id = self.sourceRow(row)
+        item = self.pinned.get(item_id)
+        if item is not None:
+            return item
+        item = self.cache.get(item_id)
+        if item is not None:
+            self.cache.move_to_end(item_id)
+            return item
+        item = self.item_for_row(item_id)
+        self.cache[item_id] = item
+        if len(self.cache) > self.capacity:
+            self.cache.popitem(last=False)
+        return item
+
+    def setItem(self, row: int, item: Item) -> None:
+        item_id = self.sourceRow(row)
+        self.cache.pop(item_id, None)
+        self.pinned[item_id] = item
+
+    def itemId(self, row: int) -> int:
+        return self.sourceRow(row)
+
+    def stableId(self, row: int) -> int:
+        return self.sourceRow(row)
+
+    def stableIds(self) -> array:
+        if self.order is None:
+            return array("q", range(self.source_count))
+        return array("q", self.order)
+
+    def itemStyle(self, row: int) -> Style:
+        return Style(offset=self.offsets.get(self.sourceRow(row), 0))
+
+    def offset(self, row: int) -> float:
+        return self.offsets.get(self.sourceRow(row), 0)
+
+    def setOffset(self, item_id: int, value: float) -> None:
+        if value:
+            self.offsets[item_id] = value
+        else:
+            self.offsets.pop(item_id, None)
+
+    def insert(self, row: int, items: Iterable[Item]) -> int:
+        item_ids = array("q")
+        for item in items:
+            self.pinned[self.next_id] = item
+            item_ids.append(self.next_id)
+            self.next_id += 1
+        self.materialize_order()[row:row] = item_ids
+        self.rows_by_source = None
+        return len(item_ids)
+
+    def remove(self, row: int, count: int) -> List[int]:
+        order = self.materialize_order()
+        removed_ids = order[row:row + count].tolist()
+        for item_id in removed_ids:
+            self.cache.pop(item_id, None)
+            self.pinned.pop(item_id, None)
+            self.offsets.pop(item_id, None)
+        del order[row:row + count]
+        self.rows_by_source = None
+        return removed_ids
+
+    def move(self, source_row: int, count: int, destination_row: int) -> None:
+        order = self.materialize_order()
+        block = order[source_row:source_row + count]
+        del order[source_row:source_row + count]
+        order[destination_row:destination_row] = block
+        self.rows_by_source = None
+
+    def permute(self, order: Sequence[int]) -> None:
+        previous_order = self.materialize_order()
+        self.order = array("q", [previous_order[row] for row in order])
+        self.rows_by_source = None
+
+    def resetOffsets(self, item_ids: Iterable[int]) -> None:
+        for item_id in item_ids:
+            self.offsets.pop(item_id, None)
+
+    def memoryPerRow(self) -> float:
+        if not len(self):
+            return 0
+        total = (sys.getsizeof(self.cache) + sys.getsizeof(self.pinned) + sys.getsizeof(self.offsets)
+                 + (sys.getsizeof(self.order) if self.order is not None else 0))
+        return total / len(self)
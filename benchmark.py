@@ -0,0 +1,223 @@
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+from typing import List, Dict, Callable
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+import PySide6
+from PySide6.QtCore import QEvent, QPointF, QElapsedTimer, Qt
+from PySide6.QtGui import QColor, QMouseEvent, QPainter
+from PySide6.QtWidgets import QApplication
+
+from Delegate import Delegate
+from DraggableListView import DraggableListView
+from ItemStore import ItemStore, CompactItemStore
+from models import Item, RenderQuality
+
+
+class BenchmarkDelegate(Delegate):
+    def __init__(self, parent, cost: int) -> None:
+        super().__init__(parent)
+        self.cost = cost
+
+    def paintContent(self, painter: QPainter, option_rect, item_style, item: Item,
+                     quality: RenderQuality = RenderQuality.Full) -> None:
+        super().paintContent(painter, option_rect, item_style, item, quality)
+        painter.setPen(QColor("#333333"))
+        # reduced quality draws a fraction of the detail
+        cost = self.cost if quality == RenderQuality.Full else self.cost // 4
+        for i in range(cost):
+            painter.drawText(option_rect.adjusted(8 + i % 50, 8, 0, 0), Qt.AlignLeft, "benchmark")
+        painter.setPen(Qt.NoPen)
+
+
+def make_items(count: int) -> List[Item]:
+    colors = [QColor(color) for color in ("#ADD8E6", "#90EE90", "#FFFFE0", "#FFC0CB", "#BA55D3")]
+    return [Item(colors[i % len(colors)]) for i in range(count)]
+
+
+def make_store(name: str):
+    return CompactItemStore() if name == "compact" else ItemStore()
+
+
+def make_view(args) -> DraggableListView:
+    view = DraggableListView()
+    view.setUniformItemSizes(args.uniform)
+    view.setItemStore(make_store(args.store))
+    view.removeRows(0, view.rowCount())
+    view.setDelegate(BenchmarkDelegate(view, args.delegate_cost))
+    view.setRenderCacheEnabled(args.render_cache)
+    view.setAsyncRenderingEnabled(args.async_render)
+    view.setAdaptiveQuality(args.adaptive_quality)
+    view.resize(args.width, args.height)
+    view.show()
+    return view
+
+
+def timed(function: Callable[[], None], repeat: int) -> List[float]:
+    samples = list()
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def summary(samples: List[float]) -> Dict[str, float]:
+    return {
+        "median_ms": statistics.median(samples),
+        "min_ms": min(samples),
+        "max_ms": max(samples),
+        "samples": len(samples),
+    }
+
+
+def bench_construction(args, count: int) -> Dict[str, float]:
+    items = make_items(count)
+    view = make_view(args)
+    start = time.perf_counter()
+    view.addItems(items)
+    elapsed = (time.perf_counter() - start) * 1000
+    view.close()
+    view.deleteLater()
+
+    tracemalloc.start()
+    view = make_view(args)
+    before, _ = tracemalloc.get_traced_memory()
+    view.addItems(items)
+    after, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    result = {
+        "construction_ms": elapsed,
+        "traced_bytes_per_item": (after - before) / count if count else 0,
+        "store_bytes_per_row": view.itemStore().memoryPerRow(),
+    }
+    view.close()
+    view.deleteLater()
+    return result
+
+
+def bench_paint(view: DraggableListView, args) -> Dict[str, float]:
+    return summary(timed(view.repaint, args.repeat))
+
+
+def bench_scroll(view: DraggableListView, args) -> Dict[str, float]:
+    scroll_bar = view.scroll_bar
+
+    def step():
+        value = scroll_bar.value() + args.scroll_step
+        if value > scroll_bar.maximum():
+            value = 0
+        scroll_bar.setValue(value)
+        view.repaint()
+
+    return summary(timed(step, args.repeat))
+
+
+def send_mouse(view: DraggableListView, event_type: QEvent.Type, position: QPointF) -> float:
+    buttons = Qt.NoButton if event_type == QEvent.Type.MouseButtonRelease else Qt.LeftButton
+    event = QMouseEvent(event_type, position, view.mapToGlobal(position), Qt.LeftButton, buttons, Qt.NoModifier)
+    start = time.perf_counter()
+    if event_type == QEvent.Type.MouseButtonPress:
+        view.mousePressEvent(event)
+    elif event_type == QEvent.Type.MouseMove:
+        view.mouseMoveEvent(event)
+    else:
+        view.mouseReleaseEvent(event)
+    return (time.perf_counter() - start) * 1000
+
+
+def bench_drag(view: DraggableListView, args) -> Dict[str, float]:
+    app = QApplication.instance()
+    view.scroll_bar.setValue(0)
+    start = QPointF(view.width() / 2, 20)
+    press_ms = send_mouse(view, QEvent.Type.MouseButtonPress, start)
+    move_samples = list()
+    for i in range(1, args.drag_steps + 1):
+        position = QPointF(start.x(), start.y() + i * (view.height() - 40) / args.drag_steps)
+        move_samples.append(send_mouse(view, QEvent.Type.MouseMove, position))
+        paint_start = time.perf_counter()
+        view.repaint()
+        move_samples[-1] += (time.perf_counter() - paint_start) * 1000
+    release_ms = send_mouse(view, QEvent.Type.MouseButtonRelease, position)
+
+    timer = QElapsedTimer()
+    timer.start()
+    while view.reorder_is_active and timer.elapsed() < 5000:
+        app.processEvents()
+    result = summary(move_samples)
+    result.update({"press_ms": press_ms, "release_ms": release_ms, "drop_animation_ms": timer.elapsed()})
+    return result
+
+
+def run(args) -> Dict:
+    results = list()
+    for count in args.sizes:
+        print(f"benchmarking {count} items", file=sys.stderr)
+        entry = {"items": count}
+        entry.update(bench_construction(args, count))
+        view = make_view(args)
+        view.addItems(make_items(count))
+        QApplication.instance().processEvents()
+        entry["paint"] = bench_paint(view, args)
+        entry["scroll"] = bench_scroll(view, args)
+        entry["drag"] = bench_drag(view, args)
+        view.close()
+        view.deleteLater()
+        results.append(entry)
+    return {
+        "environment": {
+            "python": platform.python_version(),
+            "pyside": PySide6.__version__,
+            "platform": platform.platform(),
+            "qpa": os.environ.get("QT_QPA_PLATFORM"),
+        },
+        "config": {
+            "store": args.store,
+            "uniform": args.uniform,
+            "render_cache": args.render_cache,
+            "async_render": args.async_render,
+            "adaptive_quality": args.adaptive_quality,
+            "delegate_cost": args.delegate_cost,
+            "size": [args.width, args.height],
+            "repeat": args.repeat,
+        },
+        "results": results,
+    }
+
+
+def parse_args(argv: List[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Headless DraggableListView benchmarks")
+    parser.add_argument("--sizes", type=lambda value: [int(size) for size in value.split(",")],
+                        default=[10, 1000, 100000], help="comma separated item counts")
+    parser.add_argument("--store", choices=("default", "compact"), default="default")
+    parser.add_argument("--uniform", action="store_true", help="enable uniform item sizes")
+    parser.add_argument("--render-cache", action="store_true", help="enable the pixmap render cache")
+    parser.add_argument("--adaptive-quality", action="store_true", help="degrade rendering when over frame budget")
+    parser.add_argument("--async-render", action="store_true", help="render rows on a thread pool")
+    parser.add_argument("--delegate-cost", type=int, default=0, help="extra text draws per painted row")
+    parser.add_argument("--width", type=int, default=800)
+    parser.add_argument("--height", type=int, default=600)
+    parser.add_argument("--repeat", type=int, default=50)
+    parser.add_argument("--scroll-step", type=int, default=40)
+    parser.add_argument("--drag-steps", type=int, default=60)
+    parser.add_argument("--output", help="write JSON results to this file instead of stdout")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    arguments = parse_args(sys.argv[1:])
+    app = QApplication(sys.argv)
+    report = run(arguments)
+    if arguments.output:
+        with open(arguments.output, "w") as output:
+            json.dump(report, output, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        print()
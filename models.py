@@ -1,13 +1,31 @@
+import uuid
 from dataclasses import dataclass
+from enum import Enum, auto
 
 from PySide6.QtGui import QColor
 
 
+class RenderQuality(Enum):
+    Full = auto()
+    Reduced = auto()
+
+
 @dataclass
 class Style:
     offset: float = 0
+    selected: bool = False
 
 
 @dataclass
 class Item:
     color: QColor
+    icon_path: str = ""
+    text: str = ""
+
+
+@dataclass
+class Index:
+    item: Item
+    item_style: Style
+    item_id: uuid.UUID
+    serial: int = 0